@@ -1,14 +1,26 @@
+from time import perf_counter
+
+start = perf_counter()
 from cobra.engine import CobraEngine
+from cobra.model import STARTUP_TIMES
+import_time = perf_counter() - start
 import chess
 
 
 engine = CobraEngine()
 board = chess.Board()
 
+# Startup cost: importing the engine should be cheap, TensorFlow and the model are loaded on first evaluation
+start = perf_counter()
+engine.nn_evaluation(board)
+print('Import cobra.engine:', import_time)
+print('First evaluation:', perf_counter() - start)
+for name, seconds in STARTUP_TIMES.items():
+    print(f'{name}:', seconds)
+
 for _ in range(10):
     move = engine.get_move(board)
     board.push(move)
     engine.transposition.clear()
-print(engine.killer)
-    
-
+    engine.eval_cache.clear()
+print(engine.heuristics.killers)
@@ -1,26 +1,41 @@
 import chess
 
 from cobra.zobrist import Zobrist
+from cobra import evaluation
 from cobra import helpers
 
 
 class Controller:
-    __slots__ = ('board', 'captures', 'zobrist')
-    def __init__(self, board=None):
+    __slots__ = ('board', 'captures', 'zobrist', 'track_evaluation', 'evaluation', 'evaluation_deltas')
+    def __init__(self, board=None, track_evaluation=False):
         self.board = board
         self.captures = []
         self.zobrist = Zobrist()
+
+        # Optionally keep the material and piece-square evaluation up to date incrementally
+        self.track_evaluation = track_evaluation
+        self.evaluation = None
+        self.evaluation_deltas = []
+
         if board is not None:
-            self.zobrist.calculate_zobrist_key(board)
+            self.set_board(board)
+
+    @property
+    def key(self):
+        """Zobrist key of the current position"""
+        return self.zobrist.key
 
     def set_board(self, board):
         """
         Set the board to the new board, clear the list of captures, 
-        and recalculate the zobrist key
+        and recalculate the zobrist key and evaluation
         """
         self.board = board
         self.captures.clear()
         self.zobrist.calculate_zobrist_key(board)
+        if self.track_evaluation:
+            self.evaluation = evaluation.evaluate(board)
+            self.evaluation_deltas.clear()
 
     def move(self, move):
         """Make the move passed in and update the zobrist key accordingly"""
@@ -33,6 +48,11 @@ class Controller:
             captured_pc = None
         self.captures.append((capture_square, captured_pc))
 
+        if self.track_evaluation:
+            delta = evaluation.move_delta(self.board, move, capture_square, captured_pc)
+            self.evaluation += delta
+            self.evaluation_deltas.append(delta)
+
         # Update zobrist key in case of a captured piece
         if capture_square is not None:
             self.zobrist.update_capture(capture_square, captured_pc)
@@ -60,6 +80,9 @@ class Controller:
         move = self.board.peek()
         self.zobrist.unmove(self.board, move)
 
+        if self.track_evaluation:
+            self.evaluation -= self.evaluation_deltas.pop()
+
         # Uncapture the captured piece if there is one
         capture_square, captured_pc = self.captures.pop()
         if capture_square is not None:
@@ -1,57 +1,142 @@
 import chess
-import tensorflow as tf
+import hashlib
 import time
 import numpy as np
-import chess.engine
 
 from cobra import helpers
+from cobra import snapshot
 from cobra.controller import Controller
+from cobra.evaluation import evaluate, TABLES
+from cobra.evaluation_cache import EvaluationCache
+from cobra.model import load_model, default_model_path, model_hash
+from cobra.heuristics import SearchHeuristics
+from cobra.search_board import SearchBoard
+from cobra.tablebase import Tablebase
 from cobra.transposition import TranspositionTable, TranspositionTableEntry, EXACT, UPPER, LOWER
 
+# Leaf evaluators
+NN = 'nn'
+CLASSICAL = 'classical'
+
 
 class CobraEngine:
-    __slots__ = ('model', 'controller', 'transposition', 'history', 'butterfly', 'killer', 'positions_evaluated')
-    def __init__(self):
-        # Load neural network model to predict evaluations
-        self.model = tf.keras.models.load_model('C:/Source Code/Code/chess_nn/src/nn/chess_nn_model.h5')
+    __slots__ = ('model_path', '_model', 'evaluator', 'lazy_margin', 'controller', 'transposition', 'eval_cache',
+                 'heuristics', 'tablebase', 'positions_evaluated', 'lazy_evaluations', 'stop_event', 'deadline',
+                 'node_limit')
+    def __init__(self, model_path=None, max_ply=64, tablebase_path=None, evaluator=NN, lazy_margin=None,
+                 fast_board=False, eval_cache_size=1 << 18):
+        if evaluator not in (NN, CLASSICAL):
+            raise ValueError(f'Unknown evaluator: {evaluator}')
+
+        # Neural network model to predict evaluations, loaded the first time it is needed
+        self.model_path = model_path if model_path is not None else default_model_path()
+        self._model = None
+
+        # Evaluator used at the leaves of the search. With a lazy margin, the neural network is
+        # only asked to evaluate positions whose classical evaluation is within the margin of the window
+        self.evaluator = evaluator
+        self.lazy_margin = lazy_margin
+        self.positions_evaluated = 0
+        self.lazy_evaluations = 0
 
         # Controller to make and unmake moves while also updating the zobrist key
-        self.controller = Controller()
+        # and, if the classical evaluation is used, the material and piece-square evaluation.
+        # With fast_board, the search runs on a SearchBoard instead of a python-chess board
+        track_evaluation = evaluator == CLASSICAL or lazy_margin is not None
+        if fast_board:
+            self.controller = SearchBoard(track_evaluation=track_evaluation)
+        else:
+            self.controller = Controller(track_evaluation=track_evaluation)
 
         # Transposition table
         self.transposition = TranspositionTable()
 
-        # Relative history heuristic
-        self.history = [[[0] * 64 for _ in range(64)] for _ in range(2)]
-        self.butterfly = [[[0] * 64 for _ in range(64)] for _ in range(2)]
+        # Neural network evaluations of positions reached in the search, keyed by zobrist key
+        self.eval_cache = EvaluationCache(eval_cache_size)
+
+        # Relative history, killer, counter move and continuation history heuristics
+        self.heuristics = SearchHeuristics(max_ply)
+
+        # Optional syzygy endgame tablebase, probed at the root and inside the search
+        self.tablebase = Tablebase(tablebase_path) if tablebase_path is not None else None
+
+        # Event that another thread can set to cancel the current search
+        self.stop_event = None
 
-        # Killer heuristic
-        self.killer = [[None] * 20 for _ in range(2)]
+        # Time (from time.time) and number of evaluated positions at which the current search stops
+        self.deadline = None
+        self.node_limit = None
 
-    def get_move(self, board):
-        """Return the best move given a chess board"""
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = load_model(self.model_path)
+        return self._model
+
+    def get_move(self, board, depth_limit=10, time_limit=5, node_limit=None, verbose=True,
+                 stop_event=None, callback=None):
+        """
+        Return the best move given a chess board.
+        Setting the stop event cancels the search, which then returns the best move of the
+        last completed iteration. The callback is called after every completed iteration
+        with the depth, best move, evaluation and number of positions evaluated.
+        """
         self.controller.set_board(board)
         self.positions_evaluated = 0
-        return self._IDS(board)
+        self.lazy_evaluations = 0
+        self.stop_event = stop_event
+        self.heuristics.age()
+
+        # Positions in the tablebase are already solved, so there is no need to search
+        if self.tablebase is not None:
+            self.tablebase.reset_counters()
+            if (move := self.tablebase.probe_root(board)) is not None:
+                if verbose:
+                    print('Tablebase move:', move)
+                return move
 
-    def _IDS(self, board, depth_limit=10, time_limit=5):
+        # Search on the controller's board, which is a SearchBoard copy of the board with fast_board
+        return self._IDS(self.controller.board, depth_limit, time_limit, node_limit, verbose, callback)
+
+    def _IDS(self, board, depth_limit=10, time_limit=5, node_limit=None, verbose=True, callback=None):
         """
         Iterative deepening search algorithm to find 
-        best chess move for specified colour within depth limit and time limit
+        best chess move for specified colour within depth limit and time limit.
+        The time limit and node limit are hard limits: the search stops as soon as either is reached
+        and returns the best move of the last completed iteration. A node limit makes searches reproducible.
         """
         start_time = time.time()
+        best_move = None
+        self.deadline = start_time + time_limit if time_limit is not None else None
+        self.node_limit = node_limit
+
+        # The killer table only has room for max_ply plies
+        depth_limit = min(depth_limit, self.heuristics.max_ply)
 
         for depth in range(1, depth_limit + 1):
-            evaluation, best_move = self._negamax(board, float('-inf'), float('inf'), depth, True)
-            print('Depth searched:', depth, end=', ')
-            print('Best move:', best_move, end=', ')
-            print('Evaluation', evaluation, end=', ')
-            print('Time taken:', time.time() - start_time, end=', ')
-            print('Positions evaluated:', self.positions_evaluated)
-            if time.time() - start_time > time_limit:
+            evaluation, move = self._negamax(board, float('-inf'), float('inf'), depth, True, 0)
+            # The result of an interrupted iteration is incomplete, so it is only used if there is nothing else
+            if self._stopped():
+                best_move = best_move or move or next(iter(board.legal_moves), None)
                 break
+            best_move = move
+
+            if callback is not None:
+                callback(depth, best_move, evaluation, self.positions_evaluated)
+            if verbose:
+                print('Depth searched:', depth, end=', ')
+                print('Best move:', best_move, end=', ')
+                print('Evaluation', evaluation, end=', ')
+                print('Time taken:', time.time() - start_time, end=', ')
+                print('Positions evaluated:', self.positions_evaluated, end='')
+                if self.lazy_margin is not None:
+                    print(', Lazy evaluations:', self.lazy_evaluations, end='')
+                if self.tablebase is not None:
+                    print(', Tablebase hits:', self.tablebase.hits, end='')
+                print()
         
-        print('\n')
+        if verbose:
+            print('\n')
         
         # print('Best move:', best_move)
         # print('Evaluation:', evaluation)
@@ -61,15 +146,26 @@ class CobraEngine:
         
         return best_move
 
+    def _stopped(self):
+        """Whether the search was cancelled or has reached its time or node limit"""
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        if self.node_limit is not None and self.positions_evaluated >= self.node_limit:
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
+
     def _quiescence(self, depth, board):
         if depth <= 0 or board.is_game_over():
             return
 
-    def _negamax(self, board, alpha, beta, depth, do_null):
+    def _negamax(self, board, alpha, beta, depth, do_null, ply):
+        if self._stopped():
+            return 0, None
+
         alpha_orig = alpha
 
         # See if same position has been reached before in transposition table
-        entry = self.transposition.lookup(self.controller.zobrist.key)
+        entry = self.transposition.lookup(self.controller.key)
         if entry is not None and entry.depth >= depth:
             if entry.flag == EXACT:
                 return entry.score, entry.move
@@ -81,22 +177,38 @@ class CobraEngine:
             if alpha >= beta:
                 return entry.score, entry.move
 
-        if depth <= 0 or board.is_game_over():
-            return self.nn_evaluation(board) - depth, None
+        # Finished games, e.g. by fivefold repetition or the 75 move rule, are scored before the tablebase,
+        # which does not know the history of the position
+        game_over = board.is_game_over()
+
+        # Endgame tablebase, the root is probed separately to pick a move
+        if ply > 0 and self.tablebase is not None and not game_over:
+            wdl = self.tablebase.probe_wdl(board, self.controller.key)
+            if wdl is not None:
+                return self.tablebase.score(wdl, ply), None
+
+        if depth <= 0 or game_over:
+            return self.evaluate(board, alpha, beta) - depth, None
 
         # Null move pruning
         if do_null and not board.is_check():
             self.controller.make_null_move()
             R = 2
-            score = -self._negamax(board, -beta, -beta+1, depth-R, False)[0]
+            score = -self._negamax(board, -beta, -beta+1, depth-R, False, ply+1)[0]
             self.controller.unmake_null_move()
-            
+
+            if self._stopped():
+                return 0, None
             if score >= beta:
                 return score, None
 
         best_move = None
         best_score = float('-inf')
 
+        # Previous move and the piece that made it, for counter moves and continuation history
+        previous = board.move_stack[-1] if board.move_stack and board.move_stack[-1] else None
+        previous_piece = board.piece_at(previous.to_square) if previous is not None else None
+
         def move_score(move):
             # Pv node
             if entry is not None and entry.flag == EXACT and entry.move == move:
@@ -113,24 +225,32 @@ class CobraEngine:
                 return 100 if exchange < 0 else (1000+exchange) * 5
 
             # Killer moves
-            if move == self.killer[0][depth]:
+            killer_rank = self.heuristics.killer_rank(ply, move)
+            if killer_rank == 0:
                 return 500
-            elif move == self.killer[1][depth]:
+            elif killer_rank == 1:
                 return 400
+
+            # Counter move to the previous move
+            if self.heuristics.is_counter_move(previous, move):
+                return 300
                 
-            # Quiet move, use relative history heuristic
-            hh = self.history[board.turn][move.from_square][move.to_square]
-            bf = self.butterfly[board.turn][move.from_square][move.to_square]
-            return 0 if bf == 0 else hh / bf
+            # Quiet move, use relative history and continuation history heuristics
+            piece = board.piece_at(move.from_square)
+            return self.heuristics.quiet_score(board.turn, move, piece, previous, previous_piece)
 
         moves = list(board.legal_moves)
         moves.sort(key=move_score, reverse=True)
 
         for move in moves:
             self.controller.move(move)
-            score = -self._negamax(board, -beta, -alpha, depth-1, True)[0]
+            score = -self._negamax(board, -beta, -alpha, depth-1, True, ply+1)[0]
             self.controller.unmove()
 
+            # The score of a cancelled search is meaningless, so it must not reach the heuristics
+            if self._stopped():
+                break
+
             if score > best_score:
                 best_score = score
                 best_move = move
@@ -140,14 +260,16 @@ class CobraEngine:
             
             if alpha >= beta:
                 if not is_capture:
-                    self.history[board.turn][move.from_square][move.to_square] += depth * depth
-                    if self.killer[0][depth] != move:
-                        self.killer[1][depth] = self.killer[0][depth]
-                        self.killer[0][depth] = move
+                    piece = board.piece_at(move.from_square)
+                    self.heuristics.update_cutoff(board.turn, move, piece, ply, depth, previous, previous_piece)
                 break
             else:
                 if not is_capture:
-                    self.butterfly[board.turn][move.from_square][move.to_square] += depth
+                    self.heuristics.update_fail(board.turn, move, depth)
+
+        # Results of a cancelled search are unreliable and must not be stored
+        if self._stopped():
+            return best_score, best_move
 
         # Store result in transposition table
         if score <= alpha_orig:
@@ -158,13 +280,67 @@ class CobraEngine:
             flag = EXACT
 
         entry = TranspositionTableEntry(flag, depth, best_move, best_score)
-        self.transposition.store(self.controller.zobrist.key, entry)
+        self.transposition.store(self.controller.key, entry)
 
         return best_score, best_move
 
+    def evaluate(self, board, alpha=float('-inf'), beta=float('inf')):
+        """
+        Evaluate a leaf of the search with the configured evaluator.
+        With a lazy margin, a classical evaluation that is further than the margin outside of
+        the alpha beta window is returned as is, since the neural network is unlikely to change the outcome.
+        """
+        self.positions_evaluated += 1
+        if (score := self._outcome_score(board)) is not None:
+            return score
+
+        if self.evaluator == CLASSICAL:
+            return self._classical_score(board)
+
+        if self.lazy_margin is not None:
+            score = self._classical_score(board)
+            if score + self.lazy_margin <= alpha or score - self.lazy_margin >= beta:
+                self.lazy_evaluations += 1
+                return score
+
+        return self._nn_score(board)
+
     def nn_evaluation(self, board):
         """Predict evaluation of a chess position with a neural network"""
         self.positions_evaluated += 1
+        if (score := self._outcome_score(board)) is not None:
+            return score
+        return self._nn_score(board)
+
+    def classical_evaluation(self, board):
+        """Return the material and piece-square evaluation in centipawns"""
+        self.positions_evaluated += 1
+        if (score := self._outcome_score(board)) is not None:
+            return score
+        return self._classical_score(board)
+
+    def _nn_score(self, board):
+        # Positions of the search are cached by the controller's zobrist key, other boards are evaluated directly
+        if self.controller.board is not board:
+            return float(self.model(np.array([helpers.bitboard(board)]))[0][0])
+
+        key = self.controller.key
+        score = self.eval_cache.lookup(key)
+        if score is None:
+            score = float(self.model(np.array([helpers.bitboard(board)]))[0][0])
+            self.eval_cache.store(key, score)
+        return score
+
+    def _classical_score(self, board):
+        # Use the incrementally updated evaluation when searching the controller's board
+        if self.controller.track_evaluation and self.controller.board is board:
+            score = self.controller.evaluation
+        else:
+            score = evaluate(board)
+        return score if board.turn == chess.WHITE else -score
+
+    def _outcome_score(self, board):
+        """Score of a finished game for the side to move, or None if the game is not over"""
         if (outcome := board.outcome()) is not None:
             if outcome.winner is None:
                 return 0
@@ -172,19 +348,13 @@ class CobraEngine:
                 return 100000
             else: 
                 return -100000
-
-        return self.model(np.array([helpers.bitboard(board)]))[0][0]
+        return None
     
     def static_evaluation(self, board):
         """Return the evaluation in terms of material"""
         self.positions_evaluated += 1
-        if (outcome := board.outcome()) is not None:
-            if outcome.winner is None:
-                return 0
-            elif board.turn == outcome.winner:
-                return 100000
-            else: 
-                return -100000
+        if (score := self._outcome_score(board)) is not None:
+            return score
         
         piece_scores = [1, 3, 3, 5, 9, 10000]
         white_score = 0
@@ -199,4 +369,32 @@ class CobraEngine:
         if board.turn == chess.WHITE:
             return white_score - black_score
         else:
-            return black_score - white_score
\ No newline at end of file
+            return black_score - white_score
+
+    def evaluator_hash(self):
+        """
+        Digest of everything the stored scores depend on: the evaluator, the neural network model
+        and the piece-square tables
+        """
+        digest = hashlib.sha256(f'{self.evaluator} {self.lazy_margin}'.encode())
+        if self.evaluator == NN:
+            digest.update(model_hash(self.model_path))
+        if self.evaluator == CLASSICAL or self.lazy_margin is not None:
+            digest.update(TABLES.tobytes())
+        return digest.digest()
+
+    def save_snapshot(self, path):
+        """Save the transposition table and evaluation cache to a file, to warm up a restarted engine"""
+        snapshot.save_snapshot(path, self.transposition, self.eval_cache, self.evaluator_hash())
+
+    def load_snapshot(self, path):
+        """
+        Load a snapshot saved by save_snapshot. Return False, keeping the tables as they are,
+        if there is no snapshot or it was saved with another evaluator or zobrist tables.
+        """
+        try:
+            evaluator_hash = self.evaluator_hash()
+        except OSError:
+            # Without the model file no snapshot can belong to this evaluator
+            return False
+        return snapshot.load_snapshot(path, self.transposition, self.eval_cache, evaluator_hash)
@@ -0,0 +1,149 @@
+import chess
+import numpy as np
+
+# Centipawn values of a pawn, knight, bishop, rook, queen and king, the same scale as the neural network
+PIECE_VALUES = [100, 320, 330, 500, 900, 0]
+
+# Piece-square bonuses for white as seen from white's side of the board (a8 is the first entry, h1 the last)
+_PIECE_SQUARE_BONUSES = {
+    chess.PAWN: [
+         0,   0,   0,   0,   0,   0,   0,   0,
+        50,  50,  50,  50,  50,  50,  50,  50,
+        10,  10,  20,  30,  30,  20,  10,  10,
+         5,   5,  10,  25,  25,  10,   5,   5,
+         0,   0,   0,  20,  20,   0,   0,   0,
+         5,  -5, -10,   0,   0, -10,  -5,   5,
+         5,  10,  10, -20, -20,  10,  10,   5,
+         0,   0,   0,   0,   0,   0,   0,   0
+    ],
+    chess.KNIGHT: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50
+    ],
+    chess.BISHOP: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20
+    ],
+    chess.ROOK: [
+         0,   0,   0,   0,   0,   0,   0,   0,
+         5,  10,  10,  10,  10,  10,  10,   5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+        -5,   0,   0,   0,   0,   0,   0,  -5,
+         0,   0,   0,   5,   5,   0,   0,   0
+    ],
+    chess.QUEEN: [
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+         -5,   0,   5,   5,   5,   5,   0,  -5,
+          0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20
+    ],
+    chess.KING: [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+         20,  20,   0,   0,   0,   0,  20,  20,
+         20,  30,  10,   0,   0,  10,  30,  20
+    ]
+}
+
+
+def _build_tables():
+    """
+    Material plus piece-square value of every piece on every square from white's point of view,
+    indexed by piece (white pawn to king, then black pawn to king) and square
+    """
+    tables = np.zeros((12, 64), dtype=np.int32)
+    for piece_type, bonuses in _PIECE_SQUARE_BONUSES.items():
+        for square in chess.SQUARES:
+            # The bonuses are listed from a8, so white squares are flipped vertically and black squares are not
+            tables[piece_type-1][square] = PIECE_VALUES[piece_type-1] + bonuses[square ^ 56]
+            tables[piece_type+5][square] = -(PIECE_VALUES[piece_type-1] + bonuses[square])
+    return tables
+
+
+TABLES = _build_tables()
+_FLAT_TABLES = TABLES.ravel()
+
+# Python lists are faster than numpy arrays for the single lookups of the incremental updates
+_TABLE_LISTS = TABLES.tolist()
+
+
+def piece_index(piece_type, colour):
+    """Row of the piece in TABLES"""
+    return (not colour) * 6 + piece_type - 1
+
+
+def material(board):
+    """Material balance in centipawns from white's point of view, counted with popcounts of the piece bitboards"""
+    score = 0
+    for piece_type in chess.PIECE_TYPES:
+        count = (chess.popcount(board.pieces_mask(piece_type, chess.WHITE))
+                 - chess.popcount(board.pieces_mask(piece_type, chess.BLACK)))
+        score += count * PIECE_VALUES[piece_type-1]
+    return score
+
+
+def evaluate(board):
+    """
+    Material and piece-square evaluation in centipawns from white's point of view.
+    The 12 piece bitboards are unpacked into a 12x64 array of bits and multiplied with the tables at once.
+    """
+    bitboards = np.array([board.pieces_mask(piece_type, colour)
+                          for colour in chess.COLORS
+                          for piece_type in chess.PIECE_TYPES], dtype='<u8')
+    bits = np.unpackbits(bitboards.view(np.uint8), bitorder='little')
+    return int(_FLAT_TABLES @ bits)
+
+
+def move_delta(board, move, capture_square, captured_pc):
+    """
+    Change of the evaluation from white's point of view caused by the move.
+    It is assumed that this method is called before the move is made.
+    """
+    piece = board.piece_at(move.from_square)
+    table = _TABLE_LISTS[piece_index(piece.piece_type, piece.color)]
+
+    # Move the piece, promoting it if necessary
+    delta = -table[move.from_square]
+    if move.promotion is not None:
+        delta += _TABLE_LISTS[piece_index(move.promotion, piece.color)][move.to_square]
+    else:
+        delta += table[move.to_square]
+
+    # Remove the captured piece
+    if captured_pc is not None:
+        delta -= _TABLE_LISTS[piece_index(captured_pc.piece_type, captured_pc.color)][capture_square]
+
+    # Move the rook when castling
+    if piece.piece_type == chess.KING and board.is_castling(move):
+        rook_table = _TABLE_LISTS[piece_index(chess.ROOK, piece.color)]
+        rank = chess.square_rank(move.from_square)
+        if chess.square_file(move.to_square) > chess.square_file(move.from_square):
+            rook_from, rook_to = chess.square(7, rank), chess.square(5, rank)
+        else:
+            rook_from, rook_to = chess.square(0, rank), chess.square(3, rank)
+        delta += rook_table[rook_to] - rook_table[rook_from]
+
+    return delta
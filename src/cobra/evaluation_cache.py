@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class EvaluationCache:
+    """
+    Fixed size table of evaluations indexed by the low bits of the zobrist key, so it never grows.
+    A new evaluation replaces whatever was stored in its slot, and empty slots hold NaN scores.
+    """
+    __slots__ = ('mask', 'keys', 'scores')
+    def __init__(self, size=1 << 18):
+        if size <= 0 or size & (size - 1):
+            raise ValueError(f'The evaluation cache size must be a power of two, not {size}')
+
+        self.mask = size - 1
+        self.keys = np.zeros(size, dtype=np.uint64)
+        self.scores = np.full(size, np.nan)
+
+    def __len__(self):
+        return int(np.count_nonzero(~np.isnan(self.scores)))
+
+    def lookup(self, key):
+        index = key & self.mask
+        if int(self.keys[index]) == key:
+            score = self.scores[index]
+            if score == score:
+                return float(score)
+        return None
+
+    def store(self, key, score):
+        index = key & self.mask
+        self.keys[index] = key
+        self.scores[index] = score
+
+    def clear(self):
+        self.scores.fill(np.nan)
+
+    def entries(self):
+        """Keys and scores of the stored evaluations"""
+        used = ~np.isnan(self.scores)
+        return self.keys[used], self.scores[used]
+
+    def update(self, keys, scores):
+        """Store many evaluations at once, keeping the evaluations that are already stored"""
+        keys = np.asarray(keys, dtype=np.uint64)
+        scores = np.asarray(scores, dtype=np.float64)
+        indices = (keys & np.uint64(self.mask)).astype(np.intp)
+        empty = np.isnan(self.scores[indices])
+        self.keys[indices[empty]] = keys[empty]
+        self.scores[indices[empty]] = scores[empty]
@@ -0,0 +1,111 @@
+import chess
+import numpy as np
+
+# Encoded move used to mark an empty killer or counter move slot (a1a1 is never a legal move)
+NO_MOVE = 0
+
+
+def encode_move(move):
+    """Pack a move into a small integer: 6 bits from square, 6 bits to square, 3 bits promotion"""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def decode_move(encoded):
+    """Unpack a move packed by encode_move, or None for NO_MOVE"""
+    if encoded == NO_MOVE:
+        return None
+    return chess.Move(encoded & 63, encoded >> 6 & 63, encoded >> 12 or None)
+
+
+def piece_index(piece):
+    """Index of a piece from 0 to 11, white pieces first"""
+    return (not piece.color) * 6 + piece.piece_type - 1
+
+
+class SearchHeuristics:
+    """
+    Move ordering tables of the search stored in flat numpy arrays:
+    - relative history heuristic (history and butterfly tables indexed by colour, from and to square)
+    - two killer moves for every ply of the search
+    - counter moves indexed by the from and to square of the previous move
+    - continuation history indexed by the piece and to square of the previous move and the current move
+    """
+    __slots__ = ('max_ply', 'history', 'butterfly', 'killers', 'counter_moves', 'continuation')
+    def __init__(self, max_ply=64):
+        self.max_ply = max_ply
+
+        self.history = np.zeros(2 * 64 * 64, dtype=np.int64)
+        self.butterfly = np.zeros(2 * 64 * 64, dtype=np.int64)
+        self.killers = np.zeros(2 * max_ply, dtype=np.int32)
+        self.counter_moves = np.zeros(64 * 64, dtype=np.int32)
+        self.continuation = np.zeros(12 * 64 * 12 * 64, dtype=np.int64)
+
+    def clear(self):
+        """Forget everything learned, e.g. when starting a new game"""
+        self.history.fill(0)
+        self.butterfly.fill(0)
+        self.killers.fill(NO_MOVE)
+        self.counter_moves.fill(NO_MOVE)
+        self.continuation.fill(0)
+
+    def age(self):
+        """
+        Called before every search. Killers only apply to the previous search tree so they are
+        cleared, and the history tables are halved so that stale statistics from earlier in the
+        game lose their influence over the move ordering.
+        """
+        self.killers.fill(NO_MOVE)
+        self.history >>= 1
+        self.butterfly >>= 1
+        self.continuation >>= 1
+
+    def killer_rank(self, ply, move):
+        """Return 0 if the move is the first killer at this ply, 1 if it is the second, otherwise None"""
+        encoded = encode_move(move)
+        if self.killers[2 * ply] == encoded:
+            return 0
+        if self.killers[2 * ply + 1] == encoded:
+            return 1
+        return None
+
+    def is_counter_move(self, previous, move):
+        """Whether the move is the stored refutation of the previous move"""
+        if previous is None:
+            return False
+        return self.counter_moves[previous.from_square * 64 + previous.to_square] == encode_move(move)
+
+    def quiet_score(self, turn, move, piece, previous=None, previous_piece=None):
+        """Relative history score of a quiet move including its continuation history"""
+        index = turn * 4096 + move.from_square * 64 + move.to_square
+        bf = self.butterfly[index]
+        if bf == 0:
+            return 0
+
+        hh = self.history[index]
+        if previous_piece is not None:
+            hh += self.continuation[self._continuation_index(previous, previous_piece, move, piece)]
+        return hh / bf
+
+    def update_cutoff(self, turn, move, piece, ply, depth, previous=None, previous_piece=None):
+        """Reward a quiet move that caused a beta cutoff"""
+        bonus = depth * depth
+        self.history[turn * 4096 + move.from_square * 64 + move.to_square] += bonus
+
+        # Killer moves
+        encoded = encode_move(move)
+        if self.killers[2 * ply] != encoded:
+            self.killers[2 * ply + 1] = self.killers[2 * ply]
+            self.killers[2 * ply] = encoded
+
+        if previous is not None:
+            self.counter_moves[previous.from_square * 64 + previous.to_square] = encoded
+            if previous_piece is not None:
+                self.continuation[self._continuation_index(previous, previous_piece, move, piece)] += bonus
+
+    def update_fail(self, turn, move, depth):
+        """Record a quiet move that was searched without causing a cutoff"""
+        self.butterfly[turn * 4096 + move.from_square * 64 + move.to_square] += depth
+
+    @staticmethod
+    def _continuation_index(previous, previous_piece, move, piece):
+        return ((piece_index(previous_piece) * 64 + previous.to_square) * 12 + piece_index(piece)) * 64 + move.to_square
@@ -0,0 +1,211 @@
+import argparse
+import ast
+import chess
+import chess.pgn
+
+from time import perf_counter
+from cobra import workers
+from cobra.engine import CobraEngine
+from cobra.sprt import SPRT, ACCEPT_H0, ACCEPT_H1
+
+
+# Balanced positions a few moves into common openings, each played once with either colour
+DEFAULT_OPENINGS = [
+    'rnbqkbnr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2',  # King's knight opening
+    'rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2',  # Sicilian defence
+    'rnbqkbnr/pppp1ppp/4p3/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2',  # French defence
+    'rnbqkbnr/pp1ppppp/2p5/8/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2',  # Caro-Kann defence
+    'rnbqkbnr/ppp1pppp/8/3p4/2PP4/8/PP2PPPP/RNBQKBNR b KQkq - 0 2',  # Queen's gambit
+    'rnbqkb1r/pppppp1p/5np1/8/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3',  # King's indian defence
+    'rnbqkb1r/pppp1ppp/4pn2/8/2PP4/8/PP2PPPP/RNBQKBNR w KQkq - 0 3',  # Nimzo/Queen's indian
+    'rnbqkbnr/pppp1ppp/8/4p3/2P5/8/PP1PPPPP/RNBQKBNR w KQkq - 0 2',  # English opening
+]
+
+
+class EngineConfig:
+    """
+    A named engine setup for a match. The options are passed to the CobraEngine
+    constructor and the limits are passed to get_move on every move.
+    """
+    __slots__ = ('name', 'options', 'depth_limit', 'time_limit', 'node_limit')
+    def __init__(self, name, options=None, depth_limit=10, time_limit=None, node_limit=None):
+        self.name = name
+        self.options = options or {}
+        self.depth_limit = depth_limit
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+
+
+# Engines of the current worker process, created once when the process starts
+_engines = {}
+
+
+def _init_worker(config_a, config_b):
+    """Create both engines once per worker process so the model is not reloaded every game"""
+
+    for config in (config_a, config_b):
+        _engines[config.name] = (config, CobraEngine(**config.options))
+
+
+def play_game(task):
+    """
+    Play a single game between engine A and engine B from the given opening.
+    Return the game number, the result from the point of view of engine A
+    and the game in PGN notation.
+    """
+    game_number, opening, a_name, b_name, a_is_white, max_plies = task
+    board = chess.Board(opening)
+
+    players = {
+        chess.WHITE: _engines[a_name if a_is_white else b_name],
+        chess.BLACK: _engines[b_name if a_is_white else a_name]
+    }
+    # Start every game with empty transposition, evaluation and move ordering tables so games are
+    # independent of the games the worker happened to play before
+    for _, engine in players.values():
+        engine.transposition.clear()
+        engine.eval_cache.clear()
+        engine.heuristics.clear()
+
+    while not board.is_game_over(claim_draw=True) and len(board.move_stack) < max_plies:
+        config, engine = players[board.turn]
+        # The search pushes and pops moves, so give it its own copy of the board
+        move = engine.get_move(board.copy(), config.depth_limit, config.time_limit,
+                               config.node_limit, verbose=False)
+        board.push(move)
+
+    outcome = board.outcome(claim_draw=True)
+    if outcome is None or outcome.winner is None:
+        result = 0.5
+    else:
+        result = 1 if outcome.winner == (chess.WHITE if a_is_white else chess.BLACK) else 0
+
+    game = chess.pgn.Game.from_board(board)
+    game.headers['Event'] = 'Cobra self-play'
+    game.headers['Round'] = str(game_number + 1)
+    game.headers['White'] = players[chess.WHITE][0].name
+    game.headers['Black'] = players[chess.BLACK][0].name
+    # Game.from_board uses board.result(), which ignores claimed draws
+    if outcome is None:
+        game.headers['Result'] = '1/2-1/2'
+        game.headers['Termination'] = 'adjudication'
+    else:
+        game.headers['Result'] = outcome.result()
+        game.headers['Termination'] = outcome.termination.name.lower().replace('_', ' ')
+    return game_number, result, str(game)
+
+
+def load_openings(path):
+    """Read an opening suite with one FEN or EPD position per line"""
+    openings = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                board = chess.Board(line)
+            except ValueError:
+                board, _ = chess.Board.from_epd(line)
+            openings.append(board.fen())
+    return openings
+
+
+def run_match(config_a, config_b, openings=None, games=1000, processes=4,
+              sprt=None, pgn_path=None, max_plies=300, prewarm=False):
+    """
+    Play up to the given number of games between engine A and engine B in parallel,
+    stopping early as soon as the SPRT reaches a decision. Every opening is played
+    twice with the colours reversed. Return the SPRT holding the match results.
+    With prewarm, the workers are forked from a server that has already imported the engine,
+    and the model files of both engines are read into the page cache before the workers start.
+    """
+    if config_a.name == config_b.name:
+        raise ValueError('The two engine configurations must have different names')
+
+    openings = openings or DEFAULT_OPENINGS
+    sprt = sprt or SPRT()
+
+    tasks = []
+    for game_number in range(games):
+        opening = openings[game_number // 2 % len(openings)]
+        tasks.append((game_number, opening, config_a.name, config_b.name, game_number % 2 == 0, max_plies))
+
+    start = perf_counter()
+    pgn_file = open(pgn_path, 'a') if pgn_path is not None else None
+    try:
+        model_paths = [config.options.get('model_path') for config in (config_a, config_b)]
+        context = workers.get_context(prewarm, model_paths)
+        with context.Pool(processes=processes, initializer=_init_worker, initargs=(config_a, config_b)) as p:
+            for _, result, pgn in p.imap_unordered(play_game, tasks):
+                sprt.add(result)
+                if pgn_file is not None:
+                    print(pgn, file=pgn_file, end='\n\n', flush=True)
+
+                print(sprt, f'Time: {perf_counter() - start:.0f}s')
+                if sprt.status() is not None:
+                    break
+    finally:
+        if pgn_file is not None:
+            pgn_file.close()
+
+    return sprt
+
+
+def _parse_options(options):
+    """Turn a list of key=value strings into a dictionary of engine options"""
+    parsed = {}
+    for option in options:
+        key, value = option.split('=', 1)
+        try:
+            parsed[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            parsed[key] = value
+    return parsed
+
+
+def main():
+    """Play a self-play match between two engine configurations"""
+    parser = argparse.ArgumentParser(description='Self-play match between two Cobra engine configurations')
+    parser.add_argument('--option-a', action='append', default=[], metavar='KEY=VALUE',
+                        help='CobraEngine option for engine A')
+    parser.add_argument('--option-b', action='append', default=[], metavar='KEY=VALUE',
+                        help='CobraEngine option for engine B')
+    parser.add_argument('--depth', type=int, default=10, help='Maximum search depth per move')
+    parser.add_argument('--time', type=float, default=None, help='Time limit per move in seconds')
+    parser.add_argument('--nodes', type=int, default=None, help='Node limit per move')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--openings', default=None, help='File with one FEN or EPD position per line')
+    parser.add_argument('--pgn', default='match.pgn', help='File to append the played games to')
+    parser.add_argument('--elo0', type=float, default=0)
+    parser.add_argument('--elo1', type=float, default=5)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--prewarm', action='store_true',
+                        help='Fork workers from a server that has already imported the engine')
+    args = parser.parse_args()
+
+    if args.time is None and args.nodes is None:
+        parser.error('A time limit (--time) or node limit (--nodes) is required')
+
+    limits = {'depth_limit': args.depth, 'time_limit': args.time, 'node_limit': args.nodes}
+    config_a = EngineConfig('A', _parse_options(args.option_a), **limits)
+    config_b = EngineConfig('B', _parse_options(args.option_b), **limits)
+    openings = load_openings(args.openings) if args.openings is not None else None
+
+    sprt = run_match(config_a, config_b, openings, args.games, args.processes,
+                     SPRT(args.elo0, args.elo1, args.alpha, args.beta), args.pgn, prewarm=args.prewarm)
+
+    status = sprt.status()
+    if status == ACCEPT_H1:
+        print('H1 accepted: engine A is stronger')
+    elif status == ACCEPT_H0:
+        print('H0 accepted: engine A is not stronger')
+    else:
+        print('Inconclusive: game limit reached before the SPRT finished')
+    print(sprt)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import time
+
+# Environment variable that overrides the default location of the neural network model
+MODEL_PATH_ENV = 'COBRA_MODEL_PATH'
+
+# Seconds spent importing tensorflow and loading each model in this process, to keep track of startup time
+STARTUP_TIMES = {}
+
+# Models loaded by this process (or inherited from a pre-warmed parent process), keyed by absolute path
+_models = {}
+
+
+def default_model_path():
+    """
+    Path of the neural network model used when no path is given:
+    the COBRA_MODEL_PATH environment variable if set, otherwise the model saved by nn/train_neural_network.py
+    """
+    path = os.environ.get(MODEL_PATH_ENV)
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nn', 'chess_nn_model.h5')
+    return os.path.abspath(path)
+
+
+def load_model(path=None):
+    """
+    Load the keras model at the given path. TensorFlow is only imported here, the first time
+    a model is needed, and every model is loaded at most once per process.
+    """
+    path = os.path.abspath(path) if path is not None else default_model_path()
+    if path not in _models:
+        start = time.perf_counter()
+        import tensorflow as tf
+        STARTUP_TIMES.setdefault('import tensorflow', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _models[path] = tf.keras.models.load_model(path)
+        STARTUP_TIMES[f'load {path}'] = time.perf_counter() - start
+    return _models[path]
+
+
+def is_loaded(path=None):
+    """Whether the model at the given path has already been loaded by this process"""
+    path = os.path.abspath(path) if path is not None else default_model_path()
+    return path in _models
+
+
+def model_hash(path=None):
+    """
+    SHA-256 digest of the model file, or of every file of a model saved as a directory,
+    computed without loading tensorflow
+    """
+    path = os.path.abspath(path) if path is not None else default_model_path()
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    else:
+        files = [path]
+
+    digest = hashlib.sha256()
+    for file in files:
+        digest.update(os.path.relpath(file, path).encode())
+        with open(file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.digest()
@@ -0,0 +1,107 @@
+import argparse
+import chess
+
+from time import perf_counter
+from cobra.controller import Controller
+from cobra.search_board import SearchBoard
+from cobra.zobrist import Zobrist
+
+
+# Standard perft positions with their known node counts at depth 1, 2, 3, ...
+POSITIONS = [
+    ('start', chess.STARTING_FEN,
+     [20, 400, 8902, 197281, 4865609]),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     [48, 2039, 97862, 4085603]),
+    ('position 3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     [14, 191, 2812, 43238, 674624]),
+    ('position 4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     [6, 264, 9467, 422333]),
+    ('position 5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     [44, 1486, 62379, 2103487]),
+    ('position 6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+     [46, 2079, 89890, 3894594]),
+]
+
+
+class KeyMismatch(Exception):
+    """The incrementally updated zobrist key differs from the key calculated from scratch"""
+
+
+def perft(controller, depth, check_keys=False, zobrist=None):
+    """
+    Count the leaf nodes of the tree of legal moves to the given depth, making and unmaking
+    every move through the controller like the search does.
+    With check_keys, the incremental zobrist key is compared to a freshly calculated key at every node.
+    """
+    if check_keys:
+        if zobrist is None:
+            zobrist = Zobrist()
+        zobrist.calculate_zobrist_key(controller.board)
+        if zobrist.key != controller.key:
+            raise KeyMismatch(f'Zobrist key mismatch after {" ".join(map(str, controller.board.move_stack))}')
+
+    if depth == 0:
+        return 1
+
+    nodes = 0
+    for move in list(controller.board.legal_moves):
+        controller.move(move)
+        nodes += perft(controller, depth - 1, check_keys, zobrist)
+        controller.unmove()
+    return nodes
+
+
+def run_perft(fen, depth, check_keys=False, fast_board=False):
+    """Return the perft node count of the position and the nodes per second"""
+    if fast_board:
+        controller = SearchBoard(chess.Board(fen))
+    else:
+        controller = Controller(chess.Board(fen))
+
+    start = perf_counter()
+    nodes = perft(controller, depth, check_keys)
+    seconds = perf_counter() - start
+    return nodes, nodes / max(seconds, 1e-9)
+
+
+def main():
+    """Run perft on the standard positions, checking the node counts and reporting the speed"""
+    parser = argparse.ArgumentParser(description='Perft node counts and move generation speed')
+    parser.add_argument('--depth', type=int, default=3, help='Depth, limited by the known counts of each position')
+    parser.add_argument('--fen', default=None, help='Position to count instead of the standard positions')
+    parser.add_argument('--check-keys', action='store_true',
+                        help='Compare the incremental zobrist key to a calculated key at every node')
+    parser.add_argument('--fast-board', action='store_true', help='Use a SearchBoard instead of a Controller')
+    args = parser.parse_args()
+
+    if args.fen is not None:
+        positions = [('fen', args.fen, [])]
+    else:
+        positions = POSITIONS
+
+    failed = False
+    total_nodes = 0
+    total_seconds = 0
+    for name, fen, counts in positions:
+        depth = min(args.depth, len(counts)) if counts else args.depth
+        nodes, nps = run_perft(fen, depth, args.check_keys, args.fast_board)
+        total_nodes += nodes
+        total_seconds += nodes / nps
+
+        if not counts:
+            result = ''
+        elif nodes == counts[depth-1]:
+            result = 'ok'
+        else:
+            result = f'FAILED, expected {counts[depth-1]}'
+            failed = True
+        print(f'{name:<12} depth {depth}: {nodes:>9} nodes {nps:>9.0f} nodes/s {result}')
+
+    print(f'Total: {total_nodes} nodes {total_nodes / max(total_seconds, 1e-9):.0f} nodes/s')
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
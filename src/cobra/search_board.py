@@ -0,0 +1,618 @@
+import chess
+
+from chess import (BB_SQUARES, BB_EMPTY, BB_RANK_1, BB_RANK_3, BB_RANK_6, BB_RANK_8, BB_FILE_A, BB_FILE_H,
+                   BB_KNIGHT_ATTACKS, BB_KING_ATTACKS, BB_PAWN_ATTACKS, BB_RANK_ATTACKS, BB_FILE_ATTACKS,
+                   BB_DIAG_ATTACKS, BB_RANK_MASKS, BB_FILE_MASKS, BB_DIAG_MASKS, BB_RAYS,
+                   BB_LIGHT_SQUARES, BB_DARK_SQUARES)
+
+from cobra.zobrist import Zobrist
+from cobra import evaluation
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = chess.PIECE_TYPES
+WHITE, BLACK = chess.WHITE, chess.BLACK
+
+# Between squares of every pair of squares, excluding both ends
+BB_BETWEEN = [[chess.between(a, b) for b in chess.SQUARES] for a in chess.SQUARES]
+
+# Move and piece objects are created once and shared, so the search never allocates them
+MOVES = [[chess.Move(from_square, to_square) for to_square in chess.SQUARES] for from_square in chess.SQUARES]
+PROMOTIONS = [[[chess.Move(from_square, to_square, promotion) for promotion in (QUEEN, ROOK, BISHOP, KNIGHT)]
+               for to_square in chess.SQUARES] for from_square in chess.SQUARES]
+PIECES = [[None] + [chess.Piece(piece_type, colour) for piece_type in chess.PIECE_TYPES] for colour in (BLACK, WHITE)]
+NULL_MOVE = chess.Move.null()
+
+# King's from and to square, squares the king passes over and squares that must be empty when castling,
+# keyed by the rook square in the castling rights
+_CASTLING = {
+    chess.H1: (chess.E1, chess.G1, chess.BB_F1 | chess.BB_G1, chess.BB_F1 | chess.BB_G1),
+    chess.A1: (chess.E1, chess.C1, chess.BB_C1 | chess.BB_D1, chess.BB_B1 | chess.BB_C1 | chess.BB_D1),
+    chess.H8: (chess.E8, chess.G8, chess.BB_F8 | chess.BB_G8, chess.BB_F8 | chess.BB_G8),
+    chess.A8: (chess.E8, chess.C8, chess.BB_C8 | chess.BB_D8, chess.BB_B8 | chess.BB_C8 | chess.BB_D8),
+}
+
+# Shared zobrist tables, so keys are identical to the ones calculated by the Controller
+_ZOBRIST = Zobrist()
+
+
+def _lsb(bb):
+    return (bb & -bb).bit_length() - 1
+
+
+def _squares(bb):
+    """Yield the squares of a bitboard from a1 to h8"""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+class SearchBoard:
+    """
+    Lean board for the search built on integer bitboards, with an undo stack of small tuples
+    instead of python-chess board state copies. It supports the subset of the chess.Board
+    interface used by the search and the evaluators, and keeps the zobrist key up to date
+    itself, so it can also take the place of the Controller.
+    python-chess is still used for everything else, e.g. reading positions and the GUI.
+    """
+    __slots__ = ('piece_bbs', 'occupied_co', 'occupied', 'mailbox', 'turn', 'castling_rights', 'ep_square',
+                 'halfmove_clock', 'fullmove_number', 'key', 'ep_key_file', 'move_stack', 'keys', '_stack',
+                 '_legal_moves', 'track_evaluation', 'evaluation', 'board')
+    def __init__(self, board=None, track_evaluation=False):
+        # Bitboards indexed by piece type, the first entry is unused
+        self.piece_bbs = [0] * 7
+        # Bitboards of the black and white pieces
+        self.occupied_co = [0, 0]
+        self.occupied = 0
+        # Piece type on every square, 0 for an empty square
+        self.mailbox = [0] * 64
+
+        self.turn = WHITE
+        self.castling_rights = BB_EMPTY
+        self.ep_square = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+
+        # Zobrist key and the en passant file included in it, if any
+        self.key = 0
+        self.ep_key_file = None
+
+        self.move_stack = []
+        # Zobrist keys of all earlier positions, for repetition detection
+        self.keys = []
+        self._stack = []
+        # Cached legal moves of the current position as (key, number of moves played, moves)
+        self._legal_moves = None
+
+        # Optionally keep the material and piece-square evaluation up to date incrementally
+        self.track_evaluation = track_evaluation
+        self.evaluation = None
+
+        # The board being searched, which is always this one, so it can be used like a Controller
+        self.board = self
+
+        if board is not None:
+            self.set_board(board)
+
+    def set_board(self, board):
+        """Copy the position and move history of a python-chess board"""
+        root = board.root()
+        self.piece_bbs = [0, root.pawns, root.knights, root.bishops, root.rooks, root.queens, root.kings]
+        self.occupied_co = [root.occupied_co[BLACK], root.occupied_co[WHITE]]
+        self.occupied = root.occupied
+        self.mailbox = [root.piece_type_at(square) or 0 for square in chess.SQUARES]
+        self.turn = root.turn
+        self.castling_rights = root.clean_castling_rights()
+        self.ep_square = root.ep_square
+        self.halfmove_clock = root.halfmove_clock
+        self.fullmove_number = root.fullmove_number
+
+        self.move_stack = []
+        self.keys = []
+        self._stack = []
+        self._legal_moves = None
+
+        self._calculate_key()
+        if self.track_evaluation:
+            self.evaluation = evaluation.evaluate(self)
+
+        # Replay the game so the move stack and repetition history are the same
+        for move in board.move_stack:
+            self.push(move)
+
+    def _calculate_key(self):
+        zobrist = _ZOBRIST
+        key = 0
+        for square in _squares(self.occupied):
+            colour = bool(self.occupied_co[WHITE] & BB_SQUARES[square])
+            key ^= zobrist.pieces[colour][square][self.mailbox[square]-1]
+        if self.turn == BLACK:
+            key ^= zobrist.turn
+        self.ep_key_file = self.ep_square % 8 if self.has_legal_en_passant() else None
+        if self.ep_key_file is not None:
+            key ^= zobrist.en_passant[self.ep_key_file]
+        for i, rook in enumerate(zobrist.rook_squares):
+            if self.castling_rights & rook:
+                key ^= zobrist.castling[i]
+        self.key = key
+
+    def to_board(self):
+        """Return an equivalent python-chess board, without the move history"""
+        board = chess.Board(None)
+        for square in _squares(self.occupied):
+            board.set_piece_at(square, self.piece_at(square))
+        board.turn = self.turn
+        board.castling_rights = self.castling_rights
+        board.ep_square = self.ep_square
+        board.halfmove_clock = self.halfmove_clock
+        board.fullmove_number = self.fullmove_number
+        return board
+
+    def fen(self):
+        return self.to_board().fen()
+
+    # Pieces
+
+    @property
+    def pawns(self):
+        return self.piece_bbs[PAWN]
+
+    @property
+    def knights(self):
+        return self.piece_bbs[KNIGHT]
+
+    @property
+    def bishops(self):
+        return self.piece_bbs[BISHOP]
+
+    @property
+    def rooks(self):
+        return self.piece_bbs[ROOK]
+
+    @property
+    def queens(self):
+        return self.piece_bbs[QUEEN]
+
+    @property
+    def kings(self):
+        return self.piece_bbs[KING]
+
+    def pieces_mask(self, piece_type, colour):
+        return self.piece_bbs[piece_type] & self.occupied_co[colour]
+
+    def pieces(self, piece_type, colour):
+        return chess.SquareSet(self.piece_bbs[piece_type] & self.occupied_co[colour])
+
+    def piece_type_at(self, square):
+        return self.mailbox[square] or None
+
+    def piece_at(self, square):
+        piece_type = self.mailbox[square]
+        if not piece_type:
+            return None
+        return PIECES[bool(self.occupied_co[WHITE] & BB_SQUARES[square])][piece_type]
+
+    def piece_map(self):
+        return {square: self.piece_at(square) for square in _squares(self.occupied)}
+
+    def king(self, colour):
+        king_mask = self.piece_bbs[KING] & self.occupied_co[colour]
+        return _lsb(king_mask) if king_mask else None
+
+    # Attacks
+
+    def attackers_mask(self, colour, square, occupied=None):
+        """Bitboard of the pieces of the given colour attacking the square"""
+        if occupied is None:
+            occupied = self.occupied
+        piece_bbs = self.piece_bbs
+        queens = piece_bbs[QUEEN]
+        queens_and_rooks = queens | piece_bbs[ROOK]
+        queens_and_bishops = queens | piece_bbs[BISHOP]
+
+        attackers = (
+            (BB_KING_ATTACKS[square] & piece_bbs[KING]) |
+            (BB_KNIGHT_ATTACKS[square] & piece_bbs[KNIGHT]) |
+            (BB_RANK_ATTACKS[square][BB_RANK_MASKS[square] & occupied] & queens_and_rooks) |
+            (BB_FILE_ATTACKS[square][BB_FILE_MASKS[square] & occupied] & queens_and_rooks) |
+            (BB_DIAG_ATTACKS[square][BB_DIAG_MASKS[square] & occupied] & queens_and_bishops) |
+            (BB_PAWN_ATTACKS[not colour][square] & piece_bbs[PAWN]))
+        return attackers & self.occupied_co[colour] & occupied
+
+    def is_attacked_by(self, colour, square):
+        return bool(self.attackers_mask(colour, square))
+
+    def checkers_mask(self):
+        king = self.king(self.turn)
+        return BB_EMPTY if king is None else self.attackers_mask(not self.turn, king)
+
+    def is_check(self):
+        return bool(self.checkers_mask())
+
+    def _slider_blockers(self, king):
+        """Bitboard of our pieces pinned to our king"""
+        piece_bbs = self.piece_bbs
+        queens_and_rooks = piece_bbs[QUEEN] | piece_bbs[ROOK]
+        queens_and_bishops = piece_bbs[QUEEN] | piece_bbs[BISHOP]
+        snipers = ((BB_RANK_ATTACKS[king][0] & queens_and_rooks) |
+                   (BB_FILE_ATTACKS[king][0] & queens_and_rooks) |
+                   (BB_DIAG_ATTACKS[king][0] & queens_and_bishops)) & self.occupied_co[not self.turn]
+
+        blockers = 0
+        for sniper in _squares(snipers):
+            between = BB_BETWEEN[king][sniper] & self.occupied
+            # Exactly one piece between the king and the sniper
+            if between and not between & (between - 1):
+                blockers |= between
+        return blockers & self.occupied_co[self.turn]
+
+    def _ep_capture_is_safe(self, king, from_square):
+        """Whether capturing en passant from the square leaves our king safe"""
+        captured = self.ep_square - 8 if self.turn == WHITE else self.ep_square + 8
+        occupied = self.occupied ^ BB_SQUARES[from_square] ^ BB_SQUARES[captured] | BB_SQUARES[self.ep_square]
+        return not self.attackers_mask(not self.turn, king, occupied) & ~BB_SQUARES[captured]
+
+    # Move generation
+
+    @property
+    def legal_moves(self):
+        """List of the legal moves in the current position"""
+        cached = self._legal_moves
+        if cached is not None and cached[0] == self.key and cached[1] == len(self._stack):
+            return cached[2]
+        moves = list(self.generate_legal_moves())
+        self._legal_moves = (self.key, len(self._stack), moves)
+        return moves
+
+    def has_legal_moves(self):
+        """Whether there is any legal move, stopping at the first one found"""
+        cached = self._legal_moves
+        if cached is not None and cached[0] == self.key and cached[1] == len(self._stack):
+            return bool(cached[2])
+        return next(self.generate_legal_moves(), None) is not None
+
+    def generate_legal_moves(self):
+        """Yield the legal moves one at a time, so that callers only checking for any move can stop early"""
+        turn = self.turn
+        us = self.occupied_co[turn]
+        occupied = self.occupied
+        piece_bbs = self.piece_bbs
+
+        king = _lsb(piece_bbs[KING] & us)
+        checkers = self.attackers_mask(not turn, king)
+
+        # Only the king can move out of a double check
+        if checkers & (checkers - 1):
+            yield from self._generate_king_moves(king)
+            return
+
+        if checkers:
+            # Capture the checking piece or block the check
+            targets = checkers | BB_BETWEEN[king][_lsb(checkers)]
+        else:
+            targets = ~us
+        blockers = self._slider_blockers(king)
+
+        # Pieces, which must stay on the line between the king and the pinning piece if they are pinned
+        for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN):
+            pieces = piece_bbs[piece_type] & us
+            while pieces:
+                from_bb = pieces & -pieces
+                pieces ^= from_bb
+                from_square = from_bb.bit_length() - 1
+
+                if piece_type == KNIGHT:
+                    attacks = BB_KNIGHT_ATTACKS[from_square]
+                else:
+                    attacks = 0
+                    if piece_type != BISHOP:
+                        attacks = (BB_RANK_ATTACKS[from_square][BB_RANK_MASKS[from_square] & occupied] |
+                                   BB_FILE_ATTACKS[from_square][BB_FILE_MASKS[from_square] & occupied])
+                    if piece_type != ROOK:
+                        attacks |= BB_DIAG_ATTACKS[from_square][BB_DIAG_MASKS[from_square] & occupied]
+                attacks &= targets
+                if blockers & from_bb:
+                    attacks &= BB_RAYS[king][from_square]
+
+                from_moves = MOVES[from_square]
+                while attacks:
+                    to_bb = attacks & -attacks
+                    attacks ^= to_bb
+                    yield from_moves[to_bb.bit_length() - 1]
+
+        yield from self._generate_pawn_moves(king, blockers, targets)
+        yield from self._generate_king_moves(king)
+        if not checkers:
+            yield from self._generate_castling_moves(king)
+
+    def _generate_king_moves(self, king):
+        """King moves to squares that are not attacked once the king has left its square"""
+        turn = self.turn
+        occupied_without_king = self.occupied ^ BB_SQUARES[king]
+        king_moves = MOVES[king]
+        attacks = BB_KING_ATTACKS[king] & ~self.occupied_co[turn]
+        while attacks:
+            to_bb = attacks & -attacks
+            attacks ^= to_bb
+            to_square = to_bb.bit_length() - 1
+            if not self.attackers_mask(not turn, to_square, occupied_without_king):
+                yield king_moves[to_square]
+
+    def _generate_castling_moves(self, king):
+        turn = self.turn
+        rights = self.castling_rights & (BB_RANK_1 if turn == WHITE else BB_RANK_8)
+        rooks = self.piece_bbs[ROOK] & self.occupied_co[turn]
+        for rook_square in _squares(rights & rooks):
+            king_from, king_to, king_path, empty = _CASTLING[rook_square]
+            if king != king_from or self.occupied & empty:
+                continue
+            if any(self.attackers_mask(not turn, square) for square in _squares(king_path)):
+                continue
+            yield MOVES[king_from][king_to]
+
+    def _generate_pawn_moves(self, king, blockers, targets):
+        turn = self.turn
+        pawns = self.piece_bbs[PAWN] & self.occupied_co[turn]
+        them = self.occupied_co[not turn]
+        empty = ~self.occupied & 0xffff_ffff_ffff_ffff
+
+        if turn == WHITE:
+            single = (pawns << 8) & empty
+            double = ((single & BB_RANK_3) << 8) & empty
+            left = ((pawns & ~BB_FILE_A) << 7) & them
+            right = ((pawns & ~BB_FILE_H) << 9) & them
+            push, last_rank = 8, BB_RANK_8
+        else:
+            single = (pawns >> 8) & empty
+            double = ((single & BB_RANK_6) >> 8) & empty
+            left = ((pawns & ~BB_FILE_A) >> 9) & them
+            right = ((pawns & ~BB_FILE_H) >> 7) & them
+            push, last_rank = -8, BB_RANK_1
+
+        # Pawn moves as (targets, distance from the from square)
+        for to_squares, offset in ((single, push), (double, 2 * push),
+                                   (left, push - 1), (right, push + 1)):
+            to_squares &= targets
+            while to_squares:
+                to_bb = to_squares & -to_squares
+                to_squares ^= to_bb
+                to_square = to_bb.bit_length() - 1
+                from_square = to_square - offset
+
+                if blockers & BB_SQUARES[from_square] and not BB_RAYS[king][from_square] & to_bb:
+                    continue
+                if to_bb & last_rank:
+                    yield from PROMOTIONS[from_square][to_square]
+                else:
+                    yield MOVES[from_square][to_square]
+
+        # En passant, which can also resolve a check by the pawn that just moved two squares
+        ep_square = self.ep_square
+        if ep_square is not None and not self.occupied & BB_SQUARES[ep_square]:
+            for from_square in _squares(BB_PAWN_ATTACKS[not turn][ep_square] & pawns):
+                # Checked by recomputing all attacks on the king, which covers pins and evasions
+                if self._ep_capture_is_safe(king, from_square):
+                    yield MOVES[from_square][ep_square]
+
+    def has_legal_en_passant(self):
+        """Whether the side to move can legally capture en passant"""
+        ep_square = self.ep_square
+        if ep_square is None or self.occupied & BB_SQUARES[ep_square]:
+            return False
+        turn = self.turn
+        pawns = self.piece_bbs[PAWN] & self.occupied_co[turn]
+        candidates = BB_PAWN_ATTACKS[not turn][ep_square] & pawns
+        if not candidates:
+            return False
+        king = self.king(turn)
+        return any(self._ep_capture_is_safe(king, from_square) for from_square in _squares(candidates))
+
+    # Move properties
+
+    def is_en_passant(self, move):
+        return (self.ep_square == move.to_square and self.mailbox[move.from_square] == PAWN
+                and abs(move.to_square - move.from_square) in (7, 9) and not self.mailbox[move.to_square])
+
+    def is_capture(self, move):
+        return bool(self.occupied_co[not self.turn] & BB_SQUARES[move.to_square]) or self.is_en_passant(move)
+
+    def is_castling(self, move):
+        return self.mailbox[move.from_square] == KING and abs(move.to_square - move.from_square) == 2
+
+    def is_zeroing(self, move):
+        return self.mailbox[move.from_square] == PAWN or bool(self.occupied_co[not self.turn] & BB_SQUARES[move.to_square])
+
+    # Making and unmaking moves
+
+    def _remove_piece(self, square, piece_type, colour):
+        mask = BB_SQUARES[square]
+        self.piece_bbs[piece_type] ^= mask
+        self.occupied_co[colour] ^= mask
+        self.occupied ^= mask
+        self.mailbox[square] = 0
+        self.key ^= _ZOBRIST.pieces[colour][square][piece_type-1]
+
+    def _set_piece(self, square, piece_type, colour):
+        mask = BB_SQUARES[square]
+        self.piece_bbs[piece_type] |= mask
+        self.occupied_co[colour] |= mask
+        self.occupied |= mask
+        self.mailbox[square] = piece_type
+        self.key ^= _ZOBRIST.pieces[colour][square][piece_type-1]
+
+    def push(self, move):
+        """Make a legal move or a null move"""
+        turn = self.turn
+        zobrist = _ZOBRIST
+        from_square = move.from_square
+        to_square = move.to_square
+        ep_square = self.ep_square
+
+        # The captured piece, which for en passant is not on the to square
+        captured_type = 0
+        capture_square = to_square
+        if move:
+            piece_type = self.mailbox[from_square]
+            captured_type = self.mailbox[to_square]
+            if not captured_type and piece_type == PAWN and to_square == ep_square:
+                captured_type = PAWN
+                capture_square = to_square - 8 if turn == WHITE else to_square + 8
+
+        # Everything needed to undo the move
+        self._stack.append((captured_type, capture_square, self.castling_rights, ep_square, self.ep_key_file,
+                            self.halfmove_clock, self.key, self.evaluation))
+        self.move_stack.append(move)
+        self.keys.append(self.key)
+
+        if move and self.track_evaluation:
+            captured_pc = PIECES[not turn][captured_type] if captured_type else None
+            self.evaluation += evaluation.move_delta(self, move, capture_square, captured_pc)
+
+        self.halfmove_clock += 1
+        if turn == BLACK:
+            self.fullmove_number += 1
+
+        self.ep_square = None
+        if self.ep_key_file is not None:
+            self.key ^= zobrist.en_passant[self.ep_key_file]
+            self.ep_key_file = None
+
+        if move:
+            if piece_type == PAWN or captured_type:
+                self.halfmove_clock = 0
+
+            if captured_type:
+                self._remove_piece(capture_square, captured_type, not turn)
+            self._remove_piece(from_square, piece_type, turn)
+            self._set_piece(to_square, move.promotion or piece_type, turn)
+
+            # Move the rook when castling
+            if piece_type == KING and abs(to_square - from_square) == 2:
+                rook_from, rook_to = (from_square + 3, from_square + 1) if to_square > from_square else (from_square - 4, from_square - 1)
+                self._remove_piece(rook_from, ROOK, turn)
+                self._set_piece(rook_to, ROOK, turn)
+
+            # Castling rights are lost when the king or a rook moves or a rook is captured
+            castling_rights = self.castling_rights
+            if castling_rights:
+                castling_rights &= ~BB_SQUARES[from_square] & ~BB_SQUARES[to_square]
+                if piece_type == KING:
+                    castling_rights &= ~(BB_RANK_1 if turn == WHITE else BB_RANK_8)
+                changed = castling_rights ^ self.castling_rights
+                if changed:
+                    for i, rook in enumerate(zobrist.rook_squares):
+                        if changed & rook:
+                            self.key ^= zobrist.castling[i]
+                    self.castling_rights = castling_rights
+
+            if piece_type == PAWN and abs(to_square - from_square) == 16:
+                self.ep_square = (from_square + to_square) // 2
+
+        self.turn = not turn
+        self.key ^= zobrist.turn
+
+        # The en passant square is only part of the key if the capture is legal
+        if self.ep_square is not None and self.has_legal_en_passant():
+            self.ep_key_file = self.ep_square % 8
+            self.key ^= zobrist.en_passant[self.ep_key_file]
+
+    def pop(self):
+        """Undo the last move"""
+        move = self.move_stack.pop()
+        self.keys.pop()
+        (captured_type, capture_square, castling_rights, ep_square, ep_key_file,
+         halfmove_clock, key, evaluation_before) = self._stack.pop()
+
+        self.turn = turn = not self.turn
+        if turn == BLACK:
+            self.fullmove_number -= 1
+
+        if move:
+            from_square = move.from_square
+            to_square = move.to_square
+            piece_type = PAWN if move.promotion else self.mailbox[to_square]
+
+            if piece_type == KING and abs(to_square - from_square) == 2:
+                rook_from, rook_to = (from_square + 3, from_square + 1) if to_square > from_square else (from_square - 4, from_square - 1)
+                self._remove_piece(rook_to, ROOK, turn)
+                self._set_piece(rook_from, ROOK, turn)
+
+            self._remove_piece(to_square, self.mailbox[to_square], turn)
+            self._set_piece(from_square, piece_type, turn)
+            if captured_type:
+                self._set_piece(capture_square, captured_type, not turn)
+
+        self.castling_rights = castling_rights
+        self.ep_square = ep_square
+        self.ep_key_file = ep_key_file
+        self.halfmove_clock = halfmove_clock
+        self.key = key
+        self.evaluation = evaluation_before
+        return move
+
+    def peek(self):
+        return self.move_stack[-1]
+
+    # Controller interface, so the search can use the board in place of a Controller
+
+    def move(self, move):
+        self.push(move)
+
+    def unmove(self):
+        self.pop()
+
+    def make_null_move(self):
+        self.push(NULL_MOVE)
+
+    def unmake_null_move(self):
+        self.pop()
+
+    # Game over
+
+    def is_repetition(self, count=3):
+        """Whether the current position has occurred at least count times, only looking back to the last irreversible move"""
+        key = self.key
+        keys = self.keys
+        occurrences = 1
+        for i in range(len(keys) - 2, max(len(keys) - self.halfmove_clock, 0) - 1, -2):
+            if keys[i] == key:
+                occurrences += 1
+                if occurrences >= count:
+                    return True
+        return False
+
+    def has_insufficient_material(self, colour):
+        piece_bbs = self.piece_bbs
+        ours = self.occupied_co[colour]
+        if ours & (piece_bbs[PAWN] | piece_bbs[ROOK] | piece_bbs[QUEEN]):
+            return False
+        if ours & piece_bbs[KNIGHT]:
+            return (chess.popcount(ours) <= 2 and
+                    not self.occupied_co[not colour] & ~piece_bbs[KING] & ~piece_bbs[QUEEN])
+        if ours & piece_bbs[BISHOP]:
+            same_colour = not piece_bbs[BISHOP] & BB_DARK_SQUARES or not piece_bbs[BISHOP] & BB_LIGHT_SQUARES
+            return same_colour and not piece_bbs[PAWN] and not piece_bbs[KNIGHT]
+        return True
+
+    def is_insufficient_material(self):
+        return self.has_insufficient_material(WHITE) and self.has_insufficient_material(BLACK)
+
+    def outcome(self):
+        """Outcome of the game under the same automatic rules as chess.Board.outcome, or None"""
+        has_legal_moves = self.has_legal_moves()
+        if not has_legal_moves and self.is_check():
+            return chess.Outcome(chess.Termination.CHECKMATE, not self.turn)
+        if self.is_insufficient_material():
+            return chess.Outcome(chess.Termination.INSUFFICIENT_MATERIAL, None)
+        if not has_legal_moves:
+            return chess.Outcome(chess.Termination.STALEMATE, None)
+        if self.halfmove_clock >= 150:
+            return chess.Outcome(chess.Termination.SEVENTYFIVE_MOVES, None)
+        if self.is_repetition(5):
+            return chess.Outcome(chess.Termination.FIVEFOLD_REPETITION, None)
+        return None
+
+    def is_game_over(self):
+        return self.outcome() is not None
+
+    def is_checkmate(self):
+        return self.is_check() and not self.has_legal_moves()
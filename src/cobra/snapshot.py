@@ -0,0 +1,125 @@
+import chess
+import numpy as np
+import os
+import struct
+import tempfile
+
+from cobra.heuristics import NO_MOVE, encode_move, decode_move
+from cobra.transposition import TranspositionTableEntry
+from cobra.zobrist import SEED, Zobrist
+
+MAGIC = b'COBRASNP'
+VERSION = 1
+
+# Magic, version, zobrist seed, zobrist key of the starting position, evaluator hash,
+# number of transposition table entries and number of cached evaluations
+HEADER = struct.Struct('<8sIIQ32sQQ')
+
+# Records follow the header without padding, so the file can be memory-mapped as two numpy arrays
+TT_DTYPE = np.dtype([('key', '<u8'), ('score', '<f8'), ('depth', '<i2'), ('move', '<u2'), ('flag', 'u1')])
+EVAL_DTYPE = np.dtype([('key', '<u8'), ('score', '<f8')])
+
+
+def _zobrist_stamp():
+    """Zobrist seed and key of the starting position, which change whenever the zobrist tables change"""
+    zobrist = Zobrist()
+    zobrist.calculate_zobrist_key(chess.Board())
+    return SEED, zobrist.key
+
+
+ZOBRIST_STAMP = _zobrist_stamp()
+
+
+def save_snapshot(path, transposition, eval_cache, evaluator_hash):
+    """
+    Write the transposition table and the evaluation cache to a binary file, stamped with the
+    zobrist tables and the evaluator they were computed with.
+    The file is written to a uniquely named file next to the path first and then renamed,
+    so readers never see a partial snapshot, even when several workers save at the same time.
+    """
+    entries = transposition.transposition
+    tt = np.array([(key, entry.score, entry.depth,
+                    encode_move(entry.move) if entry.move is not None else NO_MOVE, entry.flag)
+                   for key, entry in entries.items()], dtype=TT_DTYPE)
+    keys, scores = eval_cache.entries()
+    evaluations = np.empty(len(keys), dtype=EVAL_DTYPE)
+    evaluations['key'] = keys
+    evaluations['score'] = scores
+
+    seed, start_key = ZOBRIST_STAMP
+    header = HEADER.pack(MAGIC, VERSION, seed, start_key, evaluator_hash, len(tt), len(evaluations))
+
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(header)
+            f.write(tt.tobytes())
+            f.write(evaluations.tobytes())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def open_snapshot(path):
+    """
+    Memory-map a snapshot file without reading the records.
+    Return the header fields as a dictionary and the transposition table and evaluation records as numpy arrays.
+    """
+    with open(path, 'rb') as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError(f'Not a snapshot file: {path}')
+
+    magic, version, seed, start_key, evaluator_hash, tt_count, eval_count = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError(f'Not a snapshot file: {path}')
+    if version != VERSION:
+        raise ValueError(f'Unsupported snapshot version {version}: {path}')
+
+    expected_size = HEADER.size + tt_count * TT_DTYPE.itemsize + eval_count * EVAL_DTYPE.itemsize
+    if os.path.getsize(path) != expected_size:
+        raise ValueError(f'Truncated snapshot file: {path}')
+
+    header = {'seed': seed, 'start_key': start_key, 'evaluator_hash': evaluator_hash}
+    tt_offset = HEADER.size
+    eval_offset = tt_offset + tt_count * TT_DTYPE.itemsize
+
+    # numpy cannot memory-map zero length arrays
+    if tt_count:
+        tt = np.memmap(path, dtype=TT_DTYPE, mode='r', offset=tt_offset, shape=(tt_count,))
+    else:
+        tt = np.empty(0, dtype=TT_DTYPE)
+    if eval_count:
+        evaluations = np.memmap(path, dtype=EVAL_DTYPE, mode='r', offset=eval_offset, shape=(eval_count,))
+    else:
+        evaluations = np.empty(0, dtype=EVAL_DTYPE)
+    return header, tt, evaluations
+
+
+def _score(score):
+    # Scores are stored as doubles, the classical evaluation and checkmate scores in the table are integers
+    return int(score) if score.is_integer() else score
+
+
+def load_snapshot(path, transposition, eval_cache, evaluator_hash):
+    """
+    Add the entries of a snapshot file to the transposition table and evaluation cache,
+    keeping entries that are already there.
+    Return False without loading anything if the file does not exist or was made with other
+    zobrist tables or another evaluator.
+    """
+    if not os.path.exists(path):
+        return False
+
+    header, tt, evaluations = open_snapshot(path)
+    if (header['seed'], header['start_key']) != ZOBRIST_STAMP or header['evaluator_hash'] != evaluator_hash:
+        return False
+
+    entries = transposition.transposition
+    for key, score, depth, move, flag in tt.tolist():
+        if key not in entries:
+            entries[key] = TranspositionTableEntry(flag, depth, decode_move(move), _score(score))
+
+    eval_cache.update(evaluations['key'], evaluations['score'])
+    return True
@@ -0,0 +1,108 @@
+import math
+
+# Outcomes of the sequential probability ratio test
+ACCEPT_H0 = 0  # Engine A is no stronger than elo0
+ACCEPT_H1 = 1  # Engine A is at least elo1 stronger
+
+
+def elo_to_score(elo):
+    """Expected score of a player that is elo points stronger than its opponent"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score):
+    """Elo difference corresponding to an expected score between 0 and 1"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+class SPRT:
+    """
+    Keeps track of the wins, draws and losses of engine A against engine B
+    and decides between H0: elo = elo0 and H1: elo = elo1 with a
+    sequential probability ratio test, using the normal approximation
+    of the log likelihood ratio for a trinomial (win/draw/loss) model.
+    """
+    __slots__ = ('elo0', 'elo1', 'alpha', 'beta', 'wins', 'draws', 'losses')
+    def __init__(self, elo0=0, elo1=5, alpha=0.05, beta=0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    @property
+    def lower_bound(self):
+        return math.log(self.beta / (1 - self.alpha))
+
+    @property
+    def upper_bound(self):
+        return math.log((1 - self.beta) / self.alpha)
+
+    def add(self, result):
+        """Record the result of a game from the point of view of engine A (1, 0.5 or 0)"""
+        if result == 1:
+            self.wins += 1
+        elif result == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def score(self):
+        """Average score per game of engine A"""
+        if self.games == 0:
+            return 0.5
+        return (self.wins + self.draws / 2) / self.games
+
+    def _variance(self):
+        """Variance of the score of a single game"""
+        n = self.games
+        score = self.score()
+        return (self.wins + self.draws / 4) / n - score * score
+
+    def elo(self):
+        """Return the estimated elo difference and its 95% error margin"""
+        n = self.games
+        if n == 0:
+            return 0.0, float('inf')
+
+        score = self.score()
+        stdev = math.sqrt(max(self._variance(), 0) / n)
+        elo = score_to_elo(score)
+        margin = (score_to_elo(score + 1.96 * stdev) - score_to_elo(score - 1.96 * stdev)) / 2
+        return elo, margin
+
+    def llr(self):
+        """Log likelihood ratio of H1 against H0 for the games played so far"""
+        n = self.games
+        if n == 0:
+            return 0.0
+        variance = self._variance()
+        if variance <= 0:
+            return 0.0
+
+        s0 = elo_to_score(self.elo0)
+        s1 = elo_to_score(self.elo1)
+        return n * (s1 - s0) * (2 * self.score() - s0 - s1) / (2 * variance)
+
+    def status(self):
+        """Return ACCEPT_H0 or ACCEPT_H1 once the test has finished, otherwise None"""
+        llr = self.llr()
+        if llr <= self.lower_bound:
+            return ACCEPT_H0
+        if llr >= self.upper_bound:
+            return ACCEPT_H1
+        return None
+
+    def __str__(self):
+        elo, margin = self.elo()
+        return (f'Games: {self.games} (+{self.wins} ={self.draws} -{self.losses}), '
+                f'Elo: {elo:.1f} +/- {margin:.1f}, '
+                f'LLR: {self.llr():.2f} ({self.lower_bound:.2f}, {self.upper_bound:.2f})')
@@ -0,0 +1,131 @@
+import chess
+import chess.syzygy
+
+from cobra.evaluation_cache import EvaluationCache
+
+# Score of a tablebase win, below checkmate (100000) but above any evaluation
+TB_WIN = 50000
+
+# Cached in place of a WDL value for positions that are not in the tablebase files
+_MISSING = 3
+
+
+class Tablebase:
+    """
+    Syzygy endgame tablebase probing with fixed size in-memory caches of WDL and DTZ results keyed by zobrist key.
+    The counters show how often the search was answered by the tablebase instead of searching deeper.
+    """
+    __slots__ = ('tablebase', 'max_pieces', 'cache', 'dtz_cache', 'probes', 'hits', 'cache_hits')
+    def __init__(self, directory, cache_size=1 << 16):
+        self.tablebase = chess.syzygy.open_tablebase(directory)
+
+        # Largest number of pieces covered by the tables found, e.g. 'KRPvKR' has 5
+        self.max_pieces = max((len(name) - 1 for name in self.tablebase.wdl), default=0)
+
+        self.cache = EvaluationCache(cache_size)
+        self.dtz_cache = EvaluationCache(cache_size)
+
+        self.probes = 0
+        self.hits = 0
+        self.cache_hits = 0
+
+    def reset_counters(self):
+        self.probes = 0
+        self.hits = 0
+        self.cache_hits = 0
+
+    def can_probe(self, board):
+        """Whether the position could be in the tablebase, which excludes positions with castling rights"""
+        return chess.popcount(board.occupied) <= self.max_pieces and not board.castling_rights
+
+    def probe_wdl(self, board, key):
+        """
+        Return the win/draw/loss value of the position for the side to move
+        (2 win, 1 win that is a draw under the 50 move rule, 0 draw, -1, -2 loss),
+        or None if the position is not covered by the tablebase.
+        The tablebase assumes a reset halfmove clock, so wins that the 50 move rule makes
+        unreachable from the current halfmove clock are returned as 1 or -1.
+        """
+        if not self.can_probe(board):
+            return None
+
+        self.probes += 1
+        wdl = self.cache.lookup(key)
+        if wdl is not None:
+            self.cache_hits += 1
+            wdl = int(wdl)
+        else:
+            try:
+                wdl = self.tablebase.probe_wdl(self._python_chess_board(board))
+            except KeyError:
+                wdl = _MISSING
+            self.cache.store(key, wdl)
+
+        if wdl == _MISSING:
+            return None
+        self.hits += 1
+
+        if abs(wdl) == 2 and board.halfmove_clock > 0:
+            dtz = self.dtz_cache.lookup(key)
+            if dtz is None:
+                dtz = self.tablebase.probe_dtz(self._python_chess_board(board))
+                self.dtz_cache.store(key, dtz)
+            if abs(dtz) + board.halfmove_clock > 100:
+                wdl //= 2
+        return wdl
+
+    @staticmethod
+    def _python_chess_board(board):
+        # The tablebase needs a python-chess board, e.g. when searching on a SearchBoard
+        return board if isinstance(board, chess.Board) else board.to_board()
+
+    @staticmethod
+    def score(wdl, ply):
+        """Search score of a tablebase result, preferring faster wins and slower losses"""
+        if wdl > 1:
+            return TB_WIN - ply
+        if wdl < -1:
+            return -TB_WIN + ply
+        # Wins and losses that are cursed by the 50 move rule are draws
+        return 0
+
+    def probe_root(self, board):
+        """
+        Return the best move at the root according to the tablebase, or None if the position is not covered.
+        Moves are ranked by their result, then winning moves by the shortest distance to a
+        zeroing move (DTZ) and losing moves by the longest.
+        """
+        if not self.can_probe(board):
+            return None
+
+        best_move = None
+        best_rank = None
+        for move in board.legal_moves:
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    return move
+                # Both values are from the point of view of the opponent
+                wdl = -self.tablebase.probe_wdl(board)
+                dtz = abs(self.tablebase.probe_dtz(board))
+                halfmove_clock = board.halfmove_clock
+            except KeyError:
+                return None
+            finally:
+                board.pop()
+
+            # Wins that can no longer be converted before the 50 move rule are draws
+            if abs(wdl) == 2 and dtz + halfmove_clock > 100:
+                wdl //= 2
+
+            rank = (wdl, -dtz if wdl > 0 else dtz)
+            if best_rank is None or rank > best_rank:
+                best_rank = rank
+                best_move = move
+
+        if best_move is not None:
+            self.hits += 1
+        return best_move
+
+    def close(self):
+        self.tablebase.close()
@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+
+from cobra.model import default_model_path
+
+
+def warm_model_file(path=None):
+    """
+    Read the model file, or every file of a model saved as a directory, once so that it is in the
+    operating system's page cache when the workers load it. Missing files are skipped, since workers
+    using the classical evaluator never load a model.
+    """
+    path = os.path.abspath(path) if path is not None else default_model_path()
+    if os.path.isdir(path):
+        files = [os.path.join(root, name) for root, _, names in os.walk(path) for name in names]
+    elif os.path.exists(path):
+        files = [path]
+    else:
+        files = []
+
+    for file in files:
+        with open(file, 'rb') as f:
+            while f.read(1 << 20):
+                pass
+
+
+def get_context(prewarm=False, model_paths=(None,)):
+    """
+    Return the multiprocessing context to start analysis workers with.
+
+    Without prewarm, the default context is returned and every worker imports the engine,
+    TensorFlow and the model itself.
+    With prewarm, a fork server imports the engine modules once and every worker is forked from it.
+    TensorFlow is not fork-safe once it has been initialised, so the fork server never imports it.
+    Instead the model files (None for the default model) are read once here, so that every worker
+    loads them from the page cache rather than from disk.
+    """
+    if not prewarm:
+        return multiprocessing.get_context()
+
+    for path in model_paths:
+        warm_model_file(path)
+
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['cobra.engine'])
+    return context
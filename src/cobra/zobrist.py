@@ -1,16 +1,20 @@
 import chess
-from random import randint, seed
+from random import Random
+
+# Seed of the random numbers of the zobrist tables, keys are only comparable between tables with the same seed
+SEED = 1
 
 class Zobrist:
     __slots__ = ('key', 'turn', 'castling', 'en_passant', 'pieces', 'rook_squares')
     def __init__(self):
         self.key = 0
 
-        seed(1)
-        self.turn = randint(0, 2**64)
-        self.castling = [randint(0, 2**64) for _ in range(4)]
-        self.en_passant = [randint(0, 2**64) for _ in range(8)]
-        self.pieces = [[[randint(0, 2**64) for _ in range(6)] for _ in range(64)] for _ in range(2)]
+        # A private generator gives the same tables every time without reseeding the global random module
+        random = Random(SEED)
+        self.turn = random.randint(0, 2**64)
+        self.castling = [random.randint(0, 2**64) for _ in range(4)]
+        self.en_passant = [random.randint(0, 2**64) for _ in range(8)]
+        self.pieces = [[[random.randint(0, 2**64) for _ in range(6)] for _ in range(64)] for _ in range(2)]
 
         self.rook_squares = [chess.BB_H1, chess.BB_A1, chess.BB_H8, chess.BB_A8]
 
@@ -0,0 +1,62 @@
+import threading
+
+
+class EngineThread:
+    """
+    Runs engine searches on a background thread so the GUI loop never blocks.
+    The GUI starts a search, keeps drawing and polls for the result and
+    the latest search information every frame.
+    """
+    def __init__(self, engine, **limits):
+        self.engine = engine
+        self.limits = limits
+
+        self.thread = None
+        self.stop_event = None
+        self.move = None
+
+        # Depth, best move, evaluation and positions evaluated of the last completed iteration
+        self.info = None
+
+    @property
+    def thinking(self):
+        """Whether the engine is still searching"""
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def busy(self):
+        """Whether a search is running or its result has not been collected with poll yet"""
+        return self.thread is not None
+
+    def search(self, board):
+        """Start searching a copy of the board in the background"""
+        self.cancel()
+        self.move = None
+        self.info = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(board.copy(), self.stop_event), daemon=True)
+        self.thread.start()
+
+    def _run(self, board, stop_event):
+        move = self.engine.get_move(board, verbose=False, stop_event=stop_event,
+                                    callback=self._update_info, **self.limits)
+        if not stop_event.is_set():
+            self.move = move
+
+    def _update_info(self, depth, move, evaluation, positions_evaluated):
+        self.info = (depth, move, float(evaluation), positions_evaluated)
+
+    def poll(self):
+        """Return the best move once the search has finished, otherwise None"""
+        if self.thread is None or self.thinking:
+            return None
+        move, self.move = self.move, None
+        self.thread = None
+        return move
+
+    def cancel(self):
+        """Stop the current search, if any, and wait for the thread to finish"""
+        if self.thinking:
+            self.stop_event.set()
+            self.thread.join()
+        self.thread = None
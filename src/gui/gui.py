@@ -1,11 +1,12 @@
 import pygame
 import chess
 import sys
+import os
 
 
 
 class Gui:
-    def __init__(self, board):
+    def __init__(self, board, player_colour=None):
         pygame.init()
         self.SQUARE_SIZE = 100
         self.WIDTH = self.SQUARE_SIZE * 8
@@ -13,13 +14,23 @@ class Gui:
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
 
         self.board = board
+        # Colour the mouse is allowed to move for, None to allow moves for both sides
+        self.player_colour = player_colour
         self.dark_sq_colour = (180, 135, 102)
         self.light_sq_colour = (240, 217, 183)
 
         self.background = pygame.Surface((self.WIDTH, self.HEIGHT))
         self.init_background()
 
+        # Scale the piece images once instead of on every redraw
+        self.piece_images = self.load_piece_images()
+
+        # Screen squares that have changed since the screen was last updated
+        self.dirty_squares = set()
+
+        self.screen.blit(self.background, (0, 0))
         self.display_pieces()
+        pygame.display.flip()
         
         self.selected_sq = None
 
@@ -32,31 +43,37 @@ class Gui:
                 rect = x, y, self.SQUARE_SIZE, self.SQUARE_SIZE
                 pygame.draw.rect(self.background, color, rect)
     
-    def display_pieces(self):
-        piece_dict = {
-            1: 'pawn',
-            2: 'knight',
-            3: 'bishop',
-            4: 'rook', 
-            5: 'queen',
-            6: 'king'
-        }
-        for piece in chess.PIECE_TYPES:
-            for square in self.board.pieces(piece, chess.WHITE):
-                square = 63-square
-                y, x = divmod(square, 8)
-
-                img = pygame.image.load(f'images/white_{piece_dict[piece]}.png')
+    def load_piece_images(self):
+        """Load and scale the image of every piece, keyed by colour and piece type"""
+        image_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+        piece_images = {}
+        for colour, colour_name in ((chess.WHITE, 'white'), (chess.BLACK, 'black')):
+            for piece in chess.PIECE_TYPES:
+                img = pygame.image.load(os.path.join(image_dir, f'{colour_name}_{chess.piece_name(piece)}.png'))
                 img = pygame.transform.smoothscale(img, (self.SQUARE_SIZE, self.SQUARE_SIZE))
-                self.screen.blit(img, (x*self.SQUARE_SIZE, y*self.SQUARE_SIZE))
-                
-            for square in self.board.pieces(piece, chess.BLACK):
-                square = 63-square
-                y, x = divmod(square, 8)
+                piece_images[colour, piece] = img.convert_alpha()
+        return piece_images
 
-                img = pygame.image.load(f'images/black_{piece_dict[piece]}.png')
-                img = pygame.transform.smoothscale(img, (self.SQUARE_SIZE, self.SQUARE_SIZE))
-                self.screen.blit(img, (x*self.SQUARE_SIZE, y*self.SQUARE_SIZE))
+    def square_rect(self, square):
+        """Screen rectangle of a screen square"""
+        y, x = divmod(square, 8)
+        return pygame.Rect(x * self.SQUARE_SIZE, y * self.SQUARE_SIZE, self.SQUARE_SIZE, self.SQUARE_SIZE)
+
+    def display_pieces(self):
+        for square, piece in self.board.piece_map().items():
+            self.screen.blit(self.piece_images[piece.color, piece.piece_type], self.square_rect(63-square))
+
+    def draw_square(self, square):
+        """Redraw the background and piece of a single screen square"""
+        rect = self.square_rect(square)
+        self.screen.blit(self.background, rect, rect)
+        piece = self.board.piece_at(63-square)
+        if piece is not None:
+            self.screen.blit(self.piece_images[piece.color, piece.piece_type], rect)
+
+    def set_info(self, text):
+        """Show information such as the engine's search progress in the window title"""
+        pygame.display.set_caption(f'Chess GUI - {text}' if text else 'Chess GUI')
                 
     def check_events(self):
         for event in pygame.event.get():
@@ -76,7 +93,9 @@ class Gui:
                 
                 move = chess.Move.from_uci(self.to_uci(from_sq, to_sq))
                 print(move)
-                if move in self.board.legal_moves:
+                if self.player_colour is not None and self.board.turn != self.player_colour:
+                    self.selected_sq = None
+                elif move in self.board.legal_moves:
                     self.make_move(move)
                     self.selected_sq = None
                 else:
@@ -99,7 +118,15 @@ class Gui:
             last_move = self.board.peek()
             self.unhighlight_square(63-last_move.from_square)
             self.unhighlight_square(63-last_move.to_square)
+        pieces_before = self.board.piece_map()
         self.board.push(move)
+        pieces_after = self.board.piece_map()
+
+        # Squares whose piece changed, including castled rooks and pawns captured en passant
+        for square in pieces_before.keys() | pieces_after.keys():
+            if pieces_before.get(square) != pieces_after.get(square):
+                self.dirty_squares.add(63-square)
+
         square = 63-move.from_square
         self.highlight_square(square)
 
@@ -114,14 +141,20 @@ class Gui:
         light_highlight = (204,211,103)
         colour = light_highlight if y % 2 == x % 2 else dark_highlight
         pygame.draw.rect(self.background, colour, rect)
+        self.dirty_squares.add(square)
     
     def unhighlight_square(self, square):
         y, x = divmod(square, 8)
         rect = (x * self.SQUARE_SIZE, y * self.SQUARE_SIZE, self.SQUARE_SIZE, self.SQUARE_SIZE)
         colour = self.light_sq_colour if y % 2 == x % 2 else self.dark_sq_colour
         pygame.draw.rect(self.background, colour, rect)
+        self.dirty_squares.add(square)
 
     def _update_screen(self):
-        self.screen.blit(self.background, (0, 0))
-        self.display_pieces()
-        pygame.display.flip()
\ No newline at end of file
+        """Redraw only the squares that changed and push them to the display"""
+        if not self.dirty_squares:
+            return
+        for square in self.dirty_squares:
+            self.draw_square(square)
+        pygame.display.update([self.square_rect(square) for square in self.dirty_squares])
+        self.dirty_squares.clear()
\ No newline at end of file
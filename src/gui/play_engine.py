@@ -1,19 +1,42 @@
-from gui import Gui 
+from gui import Gui
 import chess
+import pygame
+import sys
 from cobra.engine import CobraEngine
+from engine_thread import EngineThread
 from time import sleep
 
+FPS = 60
+
+# The search runs in pure Python on another thread, so hand the GIL back to the
+# GUI thread more often than the default 5ms to keep the frame rate at 60 fps
+sys.setswitchinterval(0.0005)
+
 board = chess.Board()
 print(board)
-gui = Gui(board)
-engine = CobraEngine()
+gui = Gui(board, player_colour=chess.WHITE)
+engine = EngineThread(CobraEngine())
+clock = pygame.time.Clock()
 
 while True:
     gui.check_events()
-    if board.turn == chess.BLACK:
-        move = engine.get_move(board)
+
+    # Let the engine think in the background while the window keeps updating
+    if (move := engine.poll()) is not None:
         gui.make_move(move)
+        gui.set_info(None)
+    elif board.turn == chess.BLACK and not engine.busy and not board.is_game_over():
+        engine.search(board)
+
+    if engine.thinking and engine.info is not None:
+        depth, best_move, evaluation, positions_evaluated = engine.info
+        gui.set_info(f'Depth: {depth}, Best move: {best_move}, Evaluation: {evaluation:.0f}, '
+                     f'Positions evaluated: {positions_evaluated}')
+
+    gui._update_screen()
+    clock.tick(FPS)
+
     if board.is_game_over():
         sleep(3)
         print('Game over')
-        break
\ No newline at end of file
+        break
@@ -0,0 +1,56 @@
+import chess
+import time
+
+from cobra.engine import CobraEngine, CLASSICAL
+
+ITALIAN = 'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4'
+
+
+def test_node_and_time_limits_are_hard_limits():
+    board = chess.Board(ITALIAN)
+
+    engine = CobraEngine(evaluator=CLASSICAL)
+    move = engine.get_move(board, depth_limit=20, time_limit=None, node_limit=5000, verbose=False)
+    assert move in board.legal_moves
+    assert engine.positions_evaluated == 5000
+
+    engine = CobraEngine(evaluator=CLASSICAL)
+    start = time.time()
+    move = engine.get_move(board, depth_limit=20, time_limit=0.2, verbose=False)
+    assert move in board.legal_moves
+    assert time.time() - start < 0.5
+
+    # A move is returned even if not a single iteration completes
+    engine = CobraEngine(evaluator=CLASSICAL)
+    assert engine.get_move(board, time_limit=None, node_limit=0, verbose=False) in board.legal_moves
+    assert board.fen() == ITALIAN
+
+
+class StopAfter:
+    """Stop event that is set after a number of checks, remembering the move ordering tables at that moment"""
+    def __init__(self, engine, checks):
+        self.engine = engine
+        self.checks = checks
+        self.tables = None
+
+    def is_set(self):
+        self.checks -= 1
+        if self.checks == 0:
+            heuristics = self.engine.heuristics
+            self.tables = [table.copy() for table in (heuristics.history, heuristics.butterfly,
+                                                      heuristics.counter_moves, heuristics.continuation)]
+        return self.checks <= 0
+
+
+def test_cancelled_search_does_not_update_heuristics():
+    board = chess.Board(ITALIAN)
+    engine = CobraEngine(evaluator=CLASSICAL)
+    stop_event = StopAfter(engine, 3000)
+
+    move = engine.get_move(board, depth_limit=20, time_limit=None, verbose=False, stop_event=stop_event)
+    assert move in board.legal_moves
+
+    heuristics = engine.heuristics
+    for before, after in zip(stop_event.tables, (heuristics.history, heuristics.butterfly,
+                                                 heuristics.counter_moves, heuristics.continuation)):
+        assert (before == after).all()
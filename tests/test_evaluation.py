@@ -0,0 +1,78 @@
+import chess
+
+from cobra import evaluation
+from cobra.controller import Controller
+from cobra.engine import CobraEngine, CLASSICAL, NN
+from random import choice, seed
+
+
+def slow_evaluation(board):
+    """Material and piece-square evaluation from white's point of view, one square at a time"""
+    score = 0
+    for square, piece in board.piece_map().items():
+        score += int(evaluation.TABLES[evaluation.piece_index(piece.piece_type, piece.color)][square])
+    return score
+
+
+def test_evaluate_matches_square_by_square_sum():
+    assert evaluation.evaluate(chess.Board()) == 0
+    assert evaluation.material(chess.Board()) == 0
+
+    board = chess.Board('r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8')
+    assert evaluation.evaluate(board) == slow_evaluation(board)
+    assert evaluation.evaluate(board.mirror()) == -evaluation.evaluate(board)
+    assert evaluation.material(chess.Board('4k3/8/8/8/8/8/8/3QK3 w - - 0 1')) == 900
+
+
+def test_incremental_evaluation():
+    seed(0)
+    boards = [
+        chess.Board(),
+        chess.Board('r3k2r/pPpp1ppp/8/3Pp3/8/8/PPP2PPP/R3K2R w KQkq e6 0 1'),
+        chess.Board('6nr/1P1k1p1p/2n3p1/2p5/8/8/2PK1PP1/2BQ1BNR w - - 0 1')
+    ]
+    for board in boards:
+        controller = Controller(board, track_evaluation=True)
+
+        for _ in range(300):
+            if board.is_game_over():
+                break
+
+            move = choice(list(board.legal_moves))
+            controller.move(move)
+            assert controller.evaluation == evaluation.evaluate(board)
+
+            controller.unmove()
+            assert controller.evaluation == evaluation.evaluate(board)
+
+            controller.move(move)
+
+
+def test_classical_engine_wins_material():
+    engine = CobraEngine(evaluator=CLASSICAL)
+    # The black queen on d5 is hanging to the knight on c3
+    board = chess.Board('rnb1kbnr/ppp1pppp/8/3q4/8/2N5/PPPP1PPP/R1BQKBNR w KQkq - 0 3')
+
+    move = engine.get_move(board, depth_limit=3, time_limit=None, verbose=False)
+    assert move == chess.Move.from_uci('c3d5')
+    assert board.fen() == 'rnb1kbnr/ppp1pppp/8/3q4/8/2N5/PPPP1PPP/R1BQKBNR w KQkq - 0 3'
+
+
+def test_lazy_evaluation_skips_the_network_outside_the_window(monkeypatch):
+    nn_calls = []
+    monkeypatch.setattr(CobraEngine, '_nn_score', lambda self, board: nn_calls.append(board) or 12345)
+
+    engine = CobraEngine(evaluator=NN, lazy_margin=50)
+    board = chess.Board()
+    engine.controller.set_board(board)
+
+    # The classical evaluation of the starting position is 0, more than the margin below alpha or above beta
+    assert engine.evaluate(board, 100, 200) == 0
+    assert engine.evaluate(board, -200, -100) == 0
+    assert engine.lazy_evaluations == 2 and not nn_calls
+
+    # Within the margin of the window the network decides
+    assert engine.evaluate(board, 30, 200) == 12345
+    assert engine.evaluate(board, -30, 30) == 12345
+    assert engine.lazy_evaluations == 2 and len(nn_calls) == 2
+    assert engine.positions_evaluated == 4
@@ -0,0 +1,49 @@
+import chess
+
+from cobra.heuristics import SearchHeuristics
+
+
+def test_killers_are_indexed_by_ply():
+    heuristics = SearchHeuristics(max_ply=32)
+    board = chess.Board()
+    e4, d4, nf3 = (chess.Move.from_uci(uci) for uci in ('e2e4', 'd2d4', 'g1f3'))
+    pawn = board.piece_at(chess.E2)
+
+    # Plies beyond the old hard-coded limit of 20 are fine
+    heuristics.update_cutoff(chess.WHITE, e4, pawn, 25, 3)
+    heuristics.update_cutoff(chess.WHITE, d4, pawn, 25, 3)
+    assert heuristics.killer_rank(25, d4) == 0
+    assert heuristics.killer_rank(25, e4) == 1
+    assert heuristics.killer_rank(25, nf3) is None
+    assert heuristics.killer_rank(24, d4) is None
+
+
+def test_counter_move_and_continuation_history():
+    heuristics = SearchHeuristics()
+    board = chess.Board()
+    e4 = chess.Move.from_uci('e2e4')
+    board.push(e4)
+    e5 = chess.Move.from_uci('e7e5')
+    previous_piece = board.piece_at(chess.E4)
+    pawn = board.piece_at(chess.E7)
+
+    heuristics.update_fail(chess.BLACK, e5, 2)
+    heuristics.update_cutoff(chess.BLACK, e5, pawn, 1, 2, e4, previous_piece)
+
+    assert heuristics.is_counter_move(e4, e5)
+    assert not heuristics.is_counter_move(None, e5)
+    assert heuristics.quiet_score(chess.BLACK, e5, pawn, e4, previous_piece) > heuristics.quiet_score(chess.BLACK, e5, pawn)
+
+
+def test_aging_decays_history_and_clears_killers():
+    heuristics = SearchHeuristics()
+    e4 = chess.Move.from_uci('e2e4')
+    pawn = chess.Piece(chess.PAWN, chess.WHITE)
+
+    heuristics.update_fail(chess.WHITE, e4, 4)
+    heuristics.update_cutoff(chess.WHITE, e4, pawn, 0, 4)
+    history = heuristics.history.sum()
+
+    heuristics.age()
+    assert heuristics.history.sum() == history // 2
+    assert heuristics.killer_rank(0, e4) is None
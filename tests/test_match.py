@@ -0,0 +1,57 @@
+import chess.pgn
+import io
+
+from cobra import match
+from cobra.match import EngineConfig, DEFAULT_OPENINGS
+from cobra.sprt import SPRT
+
+
+def scores_from_pgn(pgn, a_is_white):
+    """Score of engine A according to the result written to the PGN"""
+    result = chess.pgn.read_game(io.StringIO(pgn)).headers['Result']
+    white_score = {'1-0': 1, '0-1': 0, '1/2-1/2': 0.5}[result]
+    return white_score if a_is_white else 1 - white_score
+
+
+def test_pgn_results_match_the_scores():
+    config_a = EngineConfig('A', {'evaluator': 'classical'}, depth_limit=3, node_limit=200)
+    config_b = EngineConfig('B', {'evaluator': 'classical', 'fast_board': True}, depth_limit=3, node_limit=200)
+    match._init_worker(config_a, config_b)
+
+    openings = [
+        # Drawn by the fifty move rule, which can be claimed before any move is played
+        '8/8/3k4/8/3r4/8/3RK3/8 w - - 100 80',
+        # Mate in one for white
+        '6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1',
+        DEFAULT_OPENINGS[0],
+    ]
+    for game_number, opening in enumerate(openings):
+        for a_is_white in (True, False):
+            _, result, pgn = match.play_game((game_number, opening, 'A', 'B', a_is_white, 20))
+            assert scores_from_pgn(pgn, a_is_white) == result
+
+            headers = chess.pgn.read_game(io.StringIO(pgn)).headers
+            if game_number == 0:
+                assert result == 0.5 and headers['Termination'] == 'fifty moves'
+            elif game_number == 1:
+                assert result == (1 if a_is_white else 0) and headers['Termination'] == 'checkmate'
+            else:
+                assert headers['Result'] != '*' and 'Termination' in headers
+
+
+def test_run_match_writes_the_counted_results(tmp_path):
+    config_a = EngineConfig('A', {'evaluator': 'classical'}, depth_limit=2, node_limit=100)
+    config_b = EngineConfig('B', {'evaluator': 'classical'}, depth_limit=2, node_limit=100)
+    pgn_path = tmp_path / 'match.pgn'
+
+    sprt = match.run_match(config_a, config_b, ['8/8/3k4/8/3r4/8/3RK3/8 w - - 100 80', DEFAULT_OPENINGS[1]],
+                           games=4, processes=2, sprt=SPRT(), pgn_path=str(pgn_path), max_plies=16)
+    assert sprt.games == 4
+
+    scores = []
+    with open(pgn_path) as f:
+        while (game := chess.pgn.read_game(f)) is not None:
+            a_is_white = game.headers['White'] == 'A'
+            scores.append(scores_from_pgn(str(game), a_is_white))
+    assert len(scores) == 4
+    assert sorted(scores) == sorted([1] * sprt.wins + [0.5] * sprt.draws + [0] * sprt.losses)
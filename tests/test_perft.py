@@ -0,0 +1,20 @@
+import chess
+import pytest
+
+from cobra.controller import Controller
+from cobra.perft import perft, run_perft, KeyMismatch, POSITIONS
+
+
+@pytest.mark.parametrize('fast_board', [False, True])
+def test_perft_counts_and_zobrist_keys(fast_board):
+    for name, fen, counts in POSITIONS:
+        nodes, nps = run_perft(fen, 2, check_keys=True, fast_board=fast_board)
+        assert nodes == counts[1], name
+        assert nps > 0
+
+
+def test_perft_detects_wrong_keys():
+    controller = Controller(chess.Board())
+    controller.zobrist.key ^= 1
+    with pytest.raises(KeyMismatch):
+        perft(controller, 1, check_keys=True)
@@ -0,0 +1,71 @@
+import chess
+
+from cobra.engine import CobraEngine, CLASSICAL
+from cobra.search_board import SearchBoard
+from cobra.zobrist import Zobrist
+from random import choice, random, seed
+
+
+def perft(board, depth):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in board.legal_moves:
+        board.push(move)
+        nodes += perft(board, depth - 1)
+        board.pop()
+    return nodes
+
+
+def test_perft():
+    positions = [
+        (chess.STARTING_FEN, 8902),
+        ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', 2039),
+        ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', 2812),
+        ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', 264),
+        ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', 1486),
+    ]
+    for fen, nodes in positions:
+        board = SearchBoard(chess.Board(fen))
+        depth = 2 if nodes < 2500 else 3
+        assert perft(board, depth) == nodes
+        assert board.fen() == fen
+
+
+def test_random_games_match_python_chess():
+    seed(0)
+    zobrist = Zobrist()
+    for _ in range(20):
+        board = chess.Board()
+        search_board = SearchBoard(board.copy())
+
+        while not board.is_game_over():
+            moves = list(board.legal_moves)
+            assert set(search_board.legal_moves) == set(moves)
+            assert search_board.fen() == board.fen()
+            zobrist.calculate_zobrist_key(board)
+            assert search_board.key == zobrist.key
+
+            move = choice(moves)
+            assert search_board.is_capture(move) == board.is_capture(move)
+            board.push(move)
+            search_board.push(move)
+            if random() < 0.3:
+                board.pop()
+                search_board.pop()
+                assert search_board.fen() == board.fen()
+                board.push(move)
+                search_board.push(move)
+
+        outcome = search_board.outcome()
+        assert (outcome.termination, outcome.winner) == (board.outcome().termination, board.outcome().winner)
+        assert search_board.to_board().fen() == board.fen()
+
+
+def test_engine_searches_on_search_board():
+    engine = CobraEngine(evaluator=CLASSICAL, fast_board=True)
+    board = chess.Board('rnb1kbnr/ppp1pppp/8/3q4/8/2N5/PPPP1PPP/R1BQKBNR w KQkq - 0 3')
+
+    move = engine.get_move(board, depth_limit=3, time_limit=None, verbose=False)
+    assert move == chess.Move.from_uci('c3d5')
+    assert board.fen() == 'rnb1kbnr/ppp1pppp/8/3q4/8/2N5/PPPP1PPP/R1BQKBNR w KQkq - 0 3'
@@ -0,0 +1,92 @@
+import chess
+import os
+import pytest
+import random
+
+from cobra import snapshot
+from cobra.engine import CobraEngine, CLASSICAL, NN
+from cobra.evaluation_cache import EvaluationCache
+from cobra.zobrist import Zobrist
+
+
+def searched_engine():
+    engine = CobraEngine(evaluator=CLASSICAL)
+    engine.get_move(chess.Board(), depth_limit=3, time_limit=None, verbose=False)
+    engine.eval_cache.store(1, 0.25)
+    engine.eval_cache.store(2 ** 64 - 1, -31.5)
+    return engine
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'engine.snapshot')
+    engine = searched_engine()
+    engine.save_snapshot(path)
+
+    restarted = CobraEngine(evaluator=CLASSICAL)
+    assert restarted.load_snapshot(path)
+    assert restarted.eval_cache.lookup(1) == 0.25
+    assert restarted.eval_cache.lookup(2 ** 64 - 1) == -31.5
+    assert len(restarted.eval_cache) == 2
+
+    entries = engine.transposition.transposition
+    assert restarted.transposition.transposition.keys() == entries.keys()
+    for key, entry in entries.items():
+        loaded = restarted.transposition.lookup(key)
+        assert (loaded.flag, loaded.depth, loaded.move, loaded.score) == \
+               (entry.flag, entry.depth, entry.move, entry.score)
+
+    # The records are memory-mapped rather than read
+    header, tt, evaluations = snapshot.open_snapshot(path)
+    assert len(tt) == len(entries) and len(evaluations) == 2
+    assert header['evaluator_hash'] == engine.evaluator_hash()
+
+    # Saving again replaces the snapshot without leaving temporary files behind
+    engine.save_snapshot(path)
+    assert os.listdir(tmp_path) == ['engine.snapshot']
+
+
+def test_stale_or_missing_snapshots_are_not_loaded(tmp_path):
+    path = str(tmp_path / 'engine.snapshot')
+    assert not CobraEngine(evaluator=CLASSICAL).load_snapshot(path)
+
+    searched_engine().save_snapshot(path)
+    other_evaluator = CobraEngine(evaluator=CLASSICAL, lazy_margin=100)
+    assert not other_evaluator.load_snapshot(path)
+    assert not other_evaluator.transposition.transposition
+
+    with open(path, 'r+b') as f:
+        f.write(b'NOTASNAP')
+    with pytest.raises(ValueError):
+        CobraEngine(evaluator=CLASSICAL).load_snapshot(path)
+
+    # The neural network evaluator cannot match any snapshot without its model file
+    assert not CobraEngine(evaluator=NN, model_path=str(tmp_path / 'missing.h5')).load_snapshot(path)
+
+
+def test_evaluation_cache_is_bounded():
+    cache = EvaluationCache(4)
+    for key in range(100):
+        cache.store(key, key / 2)
+    assert len(cache) == 4
+    assert cache.lookup(99) == 49.5
+    assert cache.lookup(3) is None
+
+    # Bulk updates keep the evaluations that are already stored
+    cache.update([6, 100], [1.0, 2.0])
+    assert cache.lookup(6) is None and cache.lookup(99) == 49.5
+
+    cache.clear()
+    assert len(cache) == 0
+    cache.update([6, 100], [1.0, 2.0])
+    assert cache.lookup(100) == 2.0
+
+    with pytest.raises(ValueError):
+        EvaluationCache(3)
+
+
+def test_zobrist_tables_do_not_reseed_the_random_module():
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    Zobrist()
+    assert random.random() == expected
@@ -0,0 +1,43 @@
+import pytest
+
+from cobra.sprt import SPRT, ACCEPT_H0, ACCEPT_H1, elo_to_score, score_to_elo
+
+
+def test_elo_score_conversion():
+    assert elo_to_score(0) == pytest.approx(0.5)
+    assert score_to_elo(0.5) == pytest.approx(0)
+    for elo in (-400, -50, 10, 200):
+        assert score_to_elo(elo_to_score(elo)) == pytest.approx(elo)
+
+
+def test_sprt_accepts_h1_for_stronger_engine():
+    sprt = SPRT(elo0=0, elo1=10)
+    for _ in range(10000):
+        for result in (1, 1, 0.5, 0):
+            sprt.add(result)
+        if sprt.status() is not None:
+            break
+
+    assert sprt.status() == ACCEPT_H1
+    elo, margin = sprt.elo()
+    assert elo > 0 and margin > 0
+
+
+def test_sprt_accepts_h0_for_equal_engines():
+    sprt = SPRT(elo0=0, elo1=10)
+    for _ in range(10000):
+        for result in (1, 0.5, 0):
+            sprt.add(result)
+        if sprt.status() is not None:
+            break
+
+    assert sprt.status() == ACCEPT_H0
+    assert sprt.wins == sprt.draws == sprt.losses
+    assert sprt.elo()[0] == pytest.approx(0)
+
+
+def test_sprt_without_games():
+    sprt = SPRT()
+    assert sprt.games == 0
+    assert sprt.llr() == 0
+    assert sprt.status() is None
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+
+def test_engine_import_is_lightweight():
+    # Importing the engine must not import tensorflow or load the model, so workers start quickly
+    code = (
+        'import sys\n'
+        'import cobra.engine, cobra.match, cobra.workers\n'
+        'engine = cobra.engine.CobraEngine(model_path="missing_model.h5")\n'
+        'assert engine._model is None\n'
+        'assert "tensorflow" not in sys.modules, "tensorflow imported at module import time"\n'
+    )
+    env = dict(os.environ)
+    src = os.path.join(os.path.dirname(__file__), '..', 'src')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [src, env.get('PYTHONPATH')]))
+    subprocess.run([sys.executable, '-c', code], env=env, check=True)
+
+
+def test_model_path_from_environment(monkeypatch, tmp_path):
+    from cobra.engine import CobraEngine
+    from cobra.model import MODEL_PATH_ENV
+
+    model_path = tmp_path / 'model.h5'
+    monkeypatch.setenv(MODEL_PATH_ENV, str(model_path))
+    assert CobraEngine().model_path == str(model_path)
+    assert CobraEngine(model_path='other.h5').model_path == 'other.h5'
+
+
+def loaded_modules(names):
+    import sys
+    return [name in sys.modules for name in names]
+
+
+def test_prewarmed_workers_do_not_import_tensorflow(tmp_path):
+    from cobra import workers
+    model_path = tmp_path / 'model.h5'
+    model_path.write_bytes(b'model')
+    environment = dict(os.environ)
+
+    # The fork server has imported the engine, but never tensorflow, which is not fork-safe
+    context = workers.get_context(prewarm=True, model_paths=[str(model_path), None])
+    with context.Pool(processes=1) as pool:
+        assert pool.apply(loaded_modules, (['cobra.engine', 'tensorflow'],)) == [True, False]
+    assert dict(os.environ) == environment
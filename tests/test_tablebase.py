@@ -0,0 +1,95 @@
+import chess
+
+from cobra.engine import CobraEngine, CLASSICAL
+from cobra.tablebase import Tablebase, TB_WIN
+from cobra.zobrist import Zobrist
+
+
+class FakeSyzygy:
+    """Stands in for the tablebase files: every position is lost for the side to move"""
+    def __init__(self):
+        self.wdl_probes = 0
+
+    def probe_wdl(self, board):
+        self.wdl_probes += 1
+        return -2
+
+    def probe_dtz(self, board):
+        return -chess.popcount(board.occupied)
+
+
+def test_empty_tablebase_directory(tmp_path):
+    tablebase = Tablebase(str(tmp_path))
+    board = chess.Board('8/8/8/4k3/8/8/8/4KQ2 w - - 0 1')
+
+    assert tablebase.max_pieces == 0
+    assert tablebase.probe_wdl(board, 0) is None
+    assert tablebase.probe_root(board) is None
+    assert tablebase.probes == tablebase.hits == 0
+
+
+def test_probe_results_are_cached_by_zobrist_key(tmp_path):
+    tablebase = Tablebase(str(tmp_path))
+    tablebase.tablebase = FakeSyzygy()
+    tablebase.max_pieces = 3
+
+    board = chess.Board('8/8/8/4k3/8/8/8/4KQ2 b - - 0 1')
+    zobrist = Zobrist()
+    zobrist.calculate_zobrist_key(board)
+
+    for _ in range(3):
+        assert tablebase.probe_wdl(board, zobrist.key) == -2
+    assert tablebase.tablebase.wdl_probes == 1
+    assert tablebase.probes == tablebase.hits == 3
+    assert tablebase.cache_hits == 2
+
+    # Too many pieces or castling rights are never probed
+    assert tablebase.probe_wdl(chess.Board(), 1) is None
+    assert tablebase.probes == 3
+
+
+def test_root_probe_and_scores(tmp_path):
+    tablebase = Tablebase(str(tmp_path))
+    tablebase.tablebase = FakeSyzygy()
+    tablebase.max_pieces = 3
+
+    board = chess.Board('8/8/8/4k3/8/8/8/4KQ2 w - - 0 1')
+    move = tablebase.probe_root(board)
+    assert move in board.legal_moves
+    assert board.fen() == '8/8/8/4k3/8/8/8/4KQ2 w - - 0 1'
+
+    assert Tablebase.score(2, 3) == TB_WIN - 3
+    assert Tablebase.score(-2, 3) == -TB_WIN + 3
+    assert Tablebase.score(1, 3) == Tablebase.score(0, 3) == Tablebase.score(-1, 3) == 0
+
+
+def test_halfmove_clock_and_finished_games(tmp_path):
+    tablebase = Tablebase(str(tmp_path))
+    tablebase.tablebase = FakeSyzygy()
+    tablebase.max_pieces = 3
+
+    # The fake loss is 3 plies from a zeroing move, which the 50 move rule allows until the clock passes 97
+    board = chess.Board('8/8/8/4k3/8/8/8/4KQ2 b - - 97 100')
+    assert tablebase.probe_wdl(board, 1) == -2
+    board.halfmove_clock = 98
+    assert tablebase.probe_wdl(board, 1) == -1
+    assert tablebase.probe_wdl(chess.Board('8/8/8/4k3/8/8/8/4KQ2 b - - 0 1'), 1) == -2
+
+    # A position drawn by the 75 move rule is scored as a draw, not as a tablebase loss
+    engine = CobraEngine(evaluator=CLASSICAL)
+    engine.tablebase = tablebase
+    board = chess.Board('8/8/8/4k3/8/8/8/4KQ2 b - - 150 100')
+    engine.controller.set_board(board)
+    assert engine._negamax(board, float('-inf'), float('inf'), 0, False, 1)[0] == 0
+
+
+def test_probe_caches_are_bounded(tmp_path):
+    tablebase = Tablebase(str(tmp_path), cache_size=16)
+    tablebase.tablebase = FakeSyzygy()
+    tablebase.max_pieces = 3
+
+    board = chess.Board('8/8/8/4k3/8/8/8/4KQ2 b - - 10 100')
+    for key in range(1000):
+        assert tablebase.probe_wdl(board, key) == -2
+    assert len(tablebase.cache) == len(tablebase.dtz_cache) == 16
+    assert tablebase.tablebase.wdl_probes == 1000